@@ -1,18 +1,304 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-import feedparser
+import asyncio
+import base64
+import hashlib
+import heapq
+import io
+import json
+import math
+import os
+import random
 import re
-import urllib
+import threading
+import time
+import unicodedata
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import xml.etree.ElementTree as ET
+from collections import Counter, OrderedDict
+from contextlib import aclosing, asynccontextmanager
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 
-def format_date(pubdate_str: str) -> str:
+# Per-feed timeout and overall per-category deadline, in seconds
+FEED_TIMEOUT = float(os.environ.get("FEED_TIMEOUT", "8"))
+CATEGORY_DEADLINE = float(os.environ.get("CATEGORY_DEADLINE", "10"))
+
+# Circuit breaker: after BREAKER_FAILURES consecutive errors or fetches slower
+# than FEED_LATENCY_BUDGET a feed is skipped, then probed again after a
+# backoff that doubles from BREAKER_BACKOFF up to BREAKER_MAX_BACKOFF seconds
+FEED_LATENCY_BUDGET = float(os.environ.get("FEED_LATENCY_BUDGET", "5"))
+BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", "3"))
+BREAKER_BACKOFF = float(os.environ.get("BREAKER_BACKOFF", "30"))
+BREAKER_MAX_BACKOFF = float(os.environ.get("BREAKER_MAX_BACKOFF", "1800"))
+
+# Category responses are fresh for CACHE_TTL seconds, then served stale for up
+# to CACHE_STALE_TTL more seconds while a background refresh runs
+CACHE_TTL = float(os.environ.get("CACHE_TTL", "300"))
+CACHE_STALE_TTL = float(os.environ.get("CACHE_STALE_TTL", "900"))
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "32"))
+
+# Optional long-lived mode: refresh every category in the background and serve
+# requests from the last published snapshot.
+# REFRESH_INTERVALS overrides per category, e.g. "technology=120,sports=600"
+PREWARM = os.environ.get("PREWARM", "0") == "1"
+REFRESH_INTERVAL = float(os.environ.get("REFRESH_INTERVAL", "300"))
+REFRESH_INTERVALS = {
+    name.strip(): float(seconds)
+    for name, seconds in (pair.split('=') for pair in os.environ.get("REFRESH_INTERVALS", "").split(',') if pair.strip())
+}
+REFRESH_JITTER = float(os.environ.get("REFRESH_JITTER", "0.2"))
+
+# Parsing backend: "thread" parses in the fetching thread; "process" sends
+# bodies larger than PARSE_INLINE_MAX_BYTES to a pool of PARSE_WORKERS processes
+PARSE_BACKEND = os.environ.get("PARSE_BACKEND", "thread")
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", "0")) or os.cpu_count() or 1
+PARSE_INLINE_MAX_BYTES = int(os.environ.get("PARSE_INLINE_MAX_BYTES", str(64 * 1024)))
+
+# Shared HTTP client: at most HOST_CONNECTIONS concurrent requests per
+# publisher host, HTTP_MAX_CONNECTIONS pooled connections overall kept alive
+# for HTTP_KEEPALIVE seconds, and feed bodies capped at FEED_MAX_BYTES
+HOST_CONNECTIONS = int(os.environ.get("HOST_CONNECTIONS", "4"))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "64"))
+HTTP_KEEPALIVE = float(os.environ.get("HTTP_KEEPALIVE", "30"))
+FEED_MAX_BYTES = int(os.environ.get("FEED_MAX_BYTES", str(5 * 1024 * 1024)))
+
+# /search covers items published (or first seen, when undated) within the
+# last SEARCH_RETENTION seconds
+SEARCH_RETENTION = float(os.environ.get("SEARCH_RETENTION", str(48 * 3600)))
+
+# Optional SQLite file holding the last good items and validators per feed,
+# so a cold process can answer from it while it refreshes (e.g. /tmp/newsapi.sqlite)
+SNAPSHOT_PATH = os.environ.get("SNAPSHOT_PATH", "")
+
+# Zone names publishers append that email.utils does not know
+TZ_ABBREVIATIONS = {'IST': '+0530', 'BST': '+0100', 'CEST': '+0200', 'CET': '+0100', 'Z': '+0000'}
+TZ_SUFFIX_RE = re.compile(r'\s*\b(IST|BST|CEST|CET|Z)$')
+RFC822_RE = re.compile(r'^(?:[A-Za-z]{3},\s*)?\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}\s')
+# Fallbacks for dates that are neither RFC 822 nor ISO 8601
+DATE_FORMATS = (
+    '%B %d, %Y %I:%M %p %z',
+    '%B %d, %Y %I:%M %p',
+    '%b %d, %Y %I:%M %p',
+)
+
+def parse_date(pubdate_str: str):
+    # Returns an aware UTC datetime, or None when no known format matches
+    value = pubdate_str.strip()
+    if not value:
+        return None
+    value = TZ_SUFFIX_RE.sub(lambda m: ' ' + TZ_ABBREVIATIONS[m.group(1)], value).strip()
+    dt = None
+    if RFC822_RE.match(value):
+        try:
+            dt = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    else:
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            for date_format in DATE_FORMATS:
+                try:
+                    dt = datetime.strptime(value, date_format)
+                    break
+                except ValueError:
+                    continue
+    if dt is None:
+        return None
+    # Naive times carry no offset; treat them as UTC
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class NewsItem:
+    title: str
+    link: str
+    pubdate: str
+    description: str
+    thumbnail_url: str
+    category: str
+    # UTC epoch seconds used for ordering, 0 when the pubdate did not parse
+    timestamp: float = 0.0
+
+    def to_dict(self):
+        return {
+            'title': self.title,
+            'link': self.link,
+            'pubdate': self.pubdate,
+            'description': self.description,
+            'thumbnail_url': self.thumbnail_url,
+            'category': self.category,
+        }
+
+    def as_row(self):
+        return (self.title, self.link, self.pubdate, self.description, self.thumbnail_url, self.category, self.timestamp)
+
+    def with_category(self, category: str):
+        return self if category == self.category else replace(self, category=category)
+
+    def encode(self) -> bytes:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+@dataclass(frozen=True)
+class CategorySnapshot:
+    items: tuple
+    # Each item pre-encoded as JSON, so responses are a join of cached bytes
+    encoded: tuple
+    built_at: float
+    # Items dropped as copies of a newer story from another feed
+    duplicates: int = 0
+
+    def __len__(self):
+        return len(self.items)
+
+EMPTY_SNAPSHOT = CategorySnapshot((), (), 0.0)
+
+def build_snapshot(news_items, duplicates: int = 0):
+    return CategorySnapshot(tuple(news_items), tuple(item.encode() for item in news_items), time.time(), duplicates)
+
+def merge_newest(runs):
+    # k-way merge of per-feed runs that are each sorted newest first. The full
+    # list is kept since one cached snapshot serves every limit and since cursor
+    return list(heapq.merge(*runs, key=attrgetter('timestamp'), reverse=True))
+
+# Cross-feed deduplication
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ocid', 'cmpid', 'ref', 'src', 'ito', 'amp', 'outputtype'}
+AMP_PATH_RE = re.compile(r'(/amp)?(\.amp)?/?$|^/amp(?=/)')
+TITLE_WORD_RE = re.compile(r'\w+')
+TITLE_STOPWORDS = {
+    'a', 'an', 'and', 'as', 'at', 'by', 'for', 'from', 'in', 'is', 'it', 'of', 'on', 'or',
+    'the', 'to', 'with', 'after', 'over', 'says', 'live', 'updates', 'watch', 'video',
+}
+
+def canonical_link(link: str) -> str:
+    # Host without www./amp./m., path without AMP variants, no tracking params
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    for prefix in ('www.', 'amp.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    path = AMP_PATH_RE.sub('', parts.path)
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if not key.startswith(('utm_', 'mc_')) and key.lower() not in TRACKING_PARAMS
+    )
+    return host + path + ('?' + urlencode(query) if query else '')
+
+def title_fingerprint(title: str) -> str:
+    # Order-insensitive set of significant words, so punctuation, casing and
+    # filler words that vary between syndicated copies do not matter
+    text = unicodedata.normalize('NFKD', title).lower()
+    words = {word for word in TITLE_WORD_RE.findall(text) if len(word) > 1 and word not in TITLE_STOPWORDS}
+    # Very short titles collide too easily to be compared
+    return ' '.join(sorted(words)) if len(words) >= 3 else ''
+
+
+class DedupIndex:
+    def __init__(self):
+        self.links = set()
+        self.titles = set()
+        self.duplicates = 0
+
+    def add(self, item: NewsItem) -> bool:
+        # Returns False when the item repeats a story already in the index
+        link = canonical_link(item.link) if item.link else ''
+        fingerprint = title_fingerprint(item.title)
+        if (link and link in self.links) or (fingerprint and fingerprint in self.titles):
+            self.duplicates += 1
+            return False
+        if link:
+            self.links.add(link)
+        if fingerprint:
+            self.titles.add(fingerprint)
+        return True
+
+def dedupe(news_items):
+    # Keeps the first, i.e. newest, copy of each story
+    index = DedupIndex()
+    unique = [item for item in news_items if index.add(item)]
+    return unique, index.duplicates
+
+def json_response(encoded, headers=None) -> Response:
+    return Response(b'[' + b','.join(encoded) + b']', media_type='application/json', headers=headers)
+
+def check_limit(limit: int, name: str = 'limit'):
+    if limit < 1:
+        raise HTTPException(status_code=400, detail=f'{name} must be at least 1')
+
+def encode_cursor(timestamp: float) -> str:
+    return base64.urlsafe_b64encode(repr(timestamp).encode('ascii')).decode('ascii').rstrip('=')
+
+def decode_since(since: str) -> float:
+    # Accepts epoch seconds, a date in any format parse_date knows, or a cursor
     try:
-        dt = parsedate_to_datetime(pubdate_str)
-        return dt.isoformat()
-    except Exception:
-        return pubdate_str
+        value = float(since)
+    except ValueError:
+        dt = parse_date(since)
+        if dt:
+            return dt.timestamp()
+        try:
+            value = float(base64.urlsafe_b64decode(since + '=' * (-len(since) % 4)).decode('ascii'))
+        except ValueError:
+            value = math.nan
+    # float() also takes nan and inf, which no item timestamp can be compared with
+    if not math.isfinite(value):
+        raise HTTPException(status_code=400, detail='since must be a timestamp or a cursor')
+    return value
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == '*' or etag in (tag.strip() for tag in if_none_match.split(','))
+
+def select_window(snapshot: CategorySnapshot, limit: int, since: str | None):
+    # Returns (start, stop, next cursor) into the snapshot's newest-first items
+    if since is None:
+        next_cursor = encode_cursor(snapshot.items[0].timestamp) if snapshot.items else None
+        return 0, limit, next_cursor
+    since_ts = decode_since(since)
+    # The newer items are a prefix. Return the oldest `limit` of them so a
+    # poller following the cursor misses none
+    newer = bisect_left(snapshot.items, -since_ts, key=lambda item: -item.timestamp)
+    start = max(newer - limit, 0)
+    if start and snapshot.items[start - 1].timestamp == snapshot.items[start].timestamp:
+        # The next poll only returns items strictly newer than the cursor, so a
+        # run of equal timestamps must not be split at the window edge. Leave
+        # the run to the next poll, or return all of it if it fills the window
+        boundary = -snapshot.items[start].timestamp
+        run_end = bisect_right(snapshot.items, boundary, key=lambda item: -item.timestamp)
+        start = run_end if run_end < newer else bisect_left(snapshot.items, boundary, key=lambda item: -item.timestamp)
+    return start, newer, encode_cursor(snapshot.items[start].timestamp if start < newer else since_ts)
 
-app = FastAPI()
+def category_response(snapshot: CategorySnapshot, limit: int, since: str | None = None, if_none_match: str | None = None) -> Response:
+    start, stop, next_cursor = select_window(snapshot, limit, since)
+    body = b'[' + b','.join(snapshot.encoded[start:stop]) + b']'
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    headers = {'ETag': etag, 'X-Duplicates': str(snapshot.duplicates)}
+    if next_cursor:
+        headers['X-Next-Cursor'] = next_cursor
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type='application/json', headers=headers)
+
+@asynccontextmanager
+async def lifespan(app):
+    if PREWARM:
+        prewarmer.start()
+    yield
+    prewarmer.stop()
+    parse_pool.shutdown()
+    await feed_client.aclose()
+
+app = FastAPI(lifespan=lifespan)
 # middleware
 app.add_middleware(
     CORSMiddleware,
@@ -22,473 +308,1210 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def wired_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url)
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '')
-        description = entry.get('description', '')
-        thumbnail = ''
-        if 'media_thumbnail' in entry:
-            thumbnail = entry['media_thumbnail'][0].get('url', '')
-        elif 'media_content' in entry:
-            thumbnail = entry['media_content'][0].get('url', '')
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def indiatoday_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url)
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '')
-        raw_desc = entry.get('description', '')
-        thumbnail = ''
-        match = re.search(r'<img[^>]+src="([^"]+)"', raw_desc)
-        if match:
-            thumbnail = match.group(1)
-        elif 'media_thumbnail' in entry:
-            thumbnail = entry['media_thumbnail'][0].get('url', '')
-        if '</a>' in raw_desc:
-            description = raw_desc.split('</a>')[-1].strip()
-        else:
-            description = re.sub(r'<.*?>', '', raw_desc).strip()
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def cnbc_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url)
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '')
-        description = entry.get('description', '')
-        thumbnail = ''
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def firstpost_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url)
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '')
-        description = entry.get('description', '')
-        thumbnail = ''
-        if 'media_content' in entry:
-            thumbnail = entry['media_content'][0].get('url', '')
-        elif 'media_thumbnail' in entry:
-            thumbnail = entry['media_thumbnail'][0].get('url', '')
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def hindustantimes_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url)
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '')
-        raw_desc = entry.get('description', '')
-        description = re.sub(r'<.*?>', '', raw_desc).strip()
-        thumbnail = ''
-        if 'media_content' in entry:
-            thumbnail = entry['media_content'][0].get('url', '')
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def nytimes_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url)
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '')
-        raw_desc = entry.get('description', '')
-        description = re.sub(r'<.*?>', '', raw_desc).strip()
-        thumbnail = ''
-        if 'media_content' in entry:
-            thumbnail = entry['media_content'][0].get('url', '')
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def mint_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url, request_headers={'User-Agent': 'Mozilla/5.0'})
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '') or entry.get('pubDate', '')
-        raw_desc = entry.get('description', '')
-        description = raw_desc.strip()
-        thumbnail = ''
-        if 'media_content' in entry:
-            thumbnail = entry['media_content'][0].get('url', '')
-        elif 'media_thumbnail' in entry:
-            thumbnail = entry['media_thumbnail'][0].get('url', '')
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def ndtv_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url, request_headers={'User-Agent': 'Mozilla/5.0'})
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '') or entry.get('pubDate', '')
-        description = entry.get('description', '') or entry.get('content', [{}])[0].get('value', '')
-        thumbnail = ''
-        if 'media_content' in entry:
-            thumbnail = entry['media_content'][0].get('url', '')
-        elif 'media_thumbnail' in entry:
-            thumbnail = entry['media_thumbnail'][0].get('url', '')
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def indianexpress_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url, request_headers={'User-Agent': 'Mozilla/5.0'})
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '') or entry.get('pubDate', '')
-        description = entry.get('description', '')
-        if not description:
-            description = entry.get('content', [{}])[0].get('value', '')
-        thumbnail = ''
-        if 'media_thumbnail' in entry:
-            thumbnail = entry['media_thumbnail'][0].get('url', '')
-        elif 'media_content' in entry:
-            thumbnail = entry['media_content'][0].get('url', '')
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def toi_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url, request_headers={'User-Agent': 'Mozilla/5.0'})
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '') or entry.get('pubDate', '')
-        raw_desc = entry.get('description', '')
-        if '</a>' in raw_desc:
-            desc_text = raw_desc.split('</a>')[-1]
-        else:
-            desc_text = raw_desc
-        description = re.sub(r'<.*?>', '', desc_text).strip()
-        thumbnail = ''
-        enclosures = entry.get('enclosures', [])
-        if enclosures:
-            thumbnail = enclosures[0].get('url', '')
-        else:
-            img_match = re.search(r'<img[^>]+src="([^\"]+)"', raw_desc)
-            if img_match:
-                thumbnail = img_match.group(1)
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def thehindu_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url, request_headers={'User-Agent': 'Mozilla/5.0'})
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '') or entry.get('pubDate', '')
-        description = entry.get('description', '')
-        thumbnail = ''
-        if 'media_content' in entry:
-            thumbnail = entry['media_content'][0].get('url', '')
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def bbc_parser(rss_url: str, category: str):
-    feed = feedparser.parse(rss_url, request_headers={'User-Agent': 'Mozilla/5.0'})
-    news_items = []
-    for entry in feed.entries[:10]:
-        title = entry.get('title', '')
-        link = entry.get('link', '')
-        pubdate = entry.get('published', '') or entry.get('pubDate', '')
-        description = entry.get('description', '')
-        thumbnail = ''
-        if 'media_thumbnail' in entry:
-            thumbnail = entry['media_thumbnail'][0].get('url', '')
-        elif 'media_content' in entry:
-            thumbnail = entry['media_content'][0].get('url', '')
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
-
-def techcrunch_parser(rss_url: str, category: str):
-    req = urllib.request.Request(rss_url, headers={'User-Agent': 'Mozilla/5.0'})
-    with urllib.request.urlopen(req) as resp:
-        raw_xml = resp.read().decode('utf-8', errors='ignore')
-    items = re.findall(r'<item>(.*?)</item>', raw_xml, re.DOTALL)[:10]
-    news_items = []
-    for block in items:
-        title_match = re.search(r'<title>\s*<!\[CDATA\[(.*?)\]\]>', block, re.DOTALL)
-        if title_match:
-            title = title_match.group(1).strip()
-        else:
-            title_plain_match = re.search(r'<title>(.*?)</title>', block, re.DOTALL)
-            title = title_plain_match.group(1).strip() if title_plain_match else ''
-        link_match = re.search(r'<link>(.*?)</link>', block)
-        link = link_match.group(1).strip() if link_match else ''
-        pubdate_match = re.search(r'<pubDate>(.*?)</pubDate>', block)
-        pubdate = pubdate_match.group(1).strip() if pubdate_match else ''
-        desc_match = re.search(r'<description>\s*<!\[CDATA\[(.*?)\]\]>', block, re.DOTALL)
-        description = desc_match.group(1).strip() if desc_match else ''
-        thumb_match = re.search(r'<media:content[^>]+url="([^\"]+)"', block)
-        if thumb_match:
-            thumbnail = thumb_match.group(1)
-        else:
-            img_match = re.search(r'<img[^>]+src="([^\"]+)"', block)
-            thumbnail = img_match.group(1) if img_match else ''
-        news_items.append({
-            'title': title,
-            'link': link,
-            'pubdate': format_date(pubdate),
-            'description': description,
-            'thumbnail_url': thumbnail,
-            'category': category,
-        })
-    return news_items
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.url.path.strip('/')
+    if route in sources or route in ("batch", "search"):
+        REQUEST_SECONDS.observe(time.perf_counter() - started, route)
+    return response
+
+# Metrics, exposed in Prometheus text format on /metrics
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def format_labels(names, values) -> str:
+    if not names:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+class MetricCounter:
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.series = Counter()
+        self.lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self.lock:
+            self.series[labels] += amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self.lock:
+            snapshot = list(self.series.items())
+        for labels, value in snapshot:
+            lines.append(f'{self.name}{format_labels(self.labelnames, labels)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                # per-bucket counts (the last one is +Inf), sum
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self.series.items()]
+        for labels, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{self.name}_bucket{format_labels(self.labelnames + ("le",), labels + (le,))} {cumulative}')
+            lines.append(f'{self.name}_sum{format_labels(self.labelnames, labels)} {total}')
+            lines.append(f'{self.name}_count{format_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+FEED_LABELS = ('feed', 'category')
+FEED_FETCH_SECONDS = Histogram('newsapi_feed_fetch_seconds', 'Wall time of a feed fetch, including parsing.', FEED_LABELS)
+FEED_PARSE_SECONDS = Histogram('newsapi_feed_parse_seconds', 'Time spent parsing a feed body.', FEED_LABELS)
+FEED_BYTES = MetricCounter('newsapi_feed_bytes_total', 'Feed body bytes downloaded.', FEED_LABELS)
+FEED_FETCHES = MetricCounter('newsapi_feed_fetches_total', 'Feed fetches by result (full, not_modified, error, skipped).', FEED_LABELS + ('result',))
+FEED_ENTRIES_PARSED = MetricCounter('newsapi_feed_entries_parsed_total', 'Entries extracted from feed bodies.', FEED_LABELS)
+FEED_ITEMS_KEPT = MetricCounter('newsapi_feed_items_kept_total', 'Items from a feed kept in a category snapshot after deduplication.', FEED_LABELS)
+DATE_PARSE_FAILURES = MetricCounter('newsapi_date_parse_failures_total', 'Non-empty pubdates that no known format matched.', FEED_LABELS)
+CACHE_REQUESTS = MetricCounter('newsapi_cache_requests_total', 'Category cache lookups by result (fresh, stale, miss).', ('category', 'result'))
+REQUEST_SECONDS = Histogram('newsapi_request_seconds', 'Handler latency of the category and batch routes.', ('route',))
+METRICS = (
+    FEED_FETCH_SECONDS, FEED_PARSE_SECONDS, FEED_BYTES, FEED_FETCHES, FEED_ENTRIES_PARSED,
+    FEED_ITEMS_KEPT, DATE_PARSE_FAILURES, CACHE_REQUESTS, REQUEST_SECONDS,
+)
+
+
+# Feed extraction specs
+ITEMS_PER_FEED = 10
+BROWSER_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+TAG_RE = re.compile(r'<.*?>')
+IMG_SRC_RE = re.compile(r'<img[^>]+src="([^"]+)"')
+READ_CHUNK_SIZE = 16 * 1024
+# Unread remainders up to this size are drained after the item budget is met,
+# so the connection can be reused; larger ones are cut off by closing it
+DRAIN_MAX_BYTES = 64 * 1024
+
+MEDIA_NS = '{http://search.yahoo.com/mrss/}'
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+RSS1_NS = '{http://purl.org/rss/1.0/}'
+ITEM_TAGS = {'item', RSS1_NS + 'item', ATOM_NS + 'entry'}
+TITLE_TAGS = {'title', RSS1_NS + 'title', ATOM_NS + 'title'}
+DESCRIPTION_TAGS = {'description', RSS1_NS + 'description', ATOM_NS + 'summary'}
+CONTENT_TAGS = {'{http://purl.org/rss/1.0/modules/content/}encoded', ATOM_NS + 'content'}
+# Date elements in order of precedence
+DATE_TAGS = ('pubDate', ATOM_NS + 'published', '{http://purl.org/dc/elements/1.1/}date', ATOM_NS + 'updated')
+
+
+def media_url(entry, key: str) -> str:
+    media = entry.get(key)
+    return media[0].get('url', '') if media else ''
+
+def description_img(entry, raw_desc: str) -> str:
+    match = IMG_SRC_RE.search(raw_desc)
+    return match.group(1) if match else ''
+
+def content_img(entry, raw_desc: str) -> str:
+    content = entry.get('content')
+    match = IMG_SRC_RE.search(content[0].get('value', '')) if content else None
+    return match.group(1) if match else ''
+
+def anchor_tail(text: str) -> str:
+    return text.split('</a>')[-1] if '</a>' in text else text
+
+THUMBNAIL_SOURCES = {
+    'media_thumbnail': lambda entry, raw_desc: media_url(entry, 'media_thumbnail'),
+    'media_content': lambda entry, raw_desc: media_url(entry, 'media_content'),
+    'enclosure': lambda entry, raw_desc: media_url(entry, 'enclosures'),
+    'description_img': description_img,
+    'content_img': content_img,
+}
+
+CLEANUP_STEPS = {
+    'anchor_tail': anchor_tail,
+    'strip_tags': lambda text: TAG_RE.sub('', text),
+    'strip': str.strip,
+}
+
+
+@dataclass(frozen=True)
+class FeedSpec:
+    # Thumbnail lookups in order of precedence, see THUMBNAIL_SOURCES
+    thumbnail: tuple = ()
+    # Description cleanup applied in order, see CLEANUP_STEPS
+    cleanup: tuple = ()
+    # Use the first content block when the description is empty
+    content_fallback: bool = False
+    headers: dict | None = None
+    thumbnail_getters: tuple = field(init=False, repr=False, compare=False)
+    cleanup_steps: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'thumbnail_getters', tuple(THUMBNAIL_SOURCES[name] for name in self.thumbnail))
+        object.__setattr__(self, 'cleanup_steps', tuple(CLEANUP_STEPS[name] for name in self.cleanup))
+
+
+FEED_SPECS = {
+    "wired": FeedSpec(thumbnail=('media_thumbnail', 'media_content')),
+    "indiatoday": FeedSpec(thumbnail=('description_img', 'media_thumbnail'), cleanup=('anchor_tail', 'strip_tags', 'strip')),
+    "cnbc": FeedSpec(),
+    "firstpost": FeedSpec(thumbnail=('media_content', 'media_thumbnail')),
+    "hindustantimes": FeedSpec(thumbnail=('media_content',), cleanup=('strip_tags', 'strip')),
+    "nytimes": FeedSpec(thumbnail=('media_content',), cleanup=('strip_tags', 'strip')),
+    "mint": FeedSpec(thumbnail=('media_content', 'media_thumbnail'), cleanup=('strip',), headers=BROWSER_HEADERS),
+    "ndtv": FeedSpec(thumbnail=('media_content', 'media_thumbnail'), content_fallback=True, headers=BROWSER_HEADERS),
+    "indianexpress": FeedSpec(thumbnail=('media_thumbnail', 'media_content'), content_fallback=True, headers=BROWSER_HEADERS),
+    "toi": FeedSpec(thumbnail=('enclosure', 'description_img'), cleanup=('anchor_tail', 'strip_tags', 'strip'), headers=BROWSER_HEADERS),
+    "thehindu": FeedSpec(thumbnail=('media_content',), headers=BROWSER_HEADERS),
+    "bbc": FeedSpec(thumbnail=('media_thumbnail', 'media_content'), headers=BROWSER_HEADERS),
+    "techcrunch": FeedSpec(thumbnail=('media_content', 'description_img', 'content_img'), cleanup=('strip',), headers=BROWSER_HEADERS),
+}
+
+
+def element_entry(elem):
+    # Map an RSS <item> or Atom <entry> to the same keys feedparser exposes
+    entry = {'media_thumbnail': [], 'media_content': [], 'enclosures': []}
+    dates = {}
+    for child in elem:
+        tag = child.tag
+        if tag in TITLE_TAGS:
+            entry.setdefault('title', (child.text or '').strip())
+        elif tag == 'link' or tag == RSS1_NS + 'link':
+            entry.setdefault('link', (child.text or '').strip())
+        elif tag == ATOM_NS + 'link':
+            rel = child.get('rel', 'alternate')
+            if rel == 'alternate':
+                entry.setdefault('link', child.get('href', ''))
+            elif rel == 'enclosure':
+                entry['enclosures'].append({'url': child.get('href', '')})
+        elif tag in DESCRIPTION_TAGS:
+            entry.setdefault('description', child.text or '')
+        elif tag in CONTENT_TAGS:
+            entry.setdefault('content', [{'value': child.text or ''}])
+        elif tag == 'enclosure':
+            entry['enclosures'].append({'url': child.get('url', '')})
+        elif tag in DATE_TAGS:
+            dates.setdefault(tag, (child.text or '').strip())
+    for tag in DATE_TAGS:
+        if dates.get(tag):
+            entry['published'] = dates[tag]
+            break
+    for media in elem.iter(MEDIA_NS + 'thumbnail'):
+        entry['media_thumbnail'].append({'url': media.get('url', '')})
+    for media in elem.iter(MEDIA_NS + 'content'):
+        entry['media_content'].append({'url': media.get('url', '')})
+    return entry
+
+
+class ItemExtractor:
+    # Incremental RSS/Atom reader that stops once `budget` items were seen
+    def __init__(self, budget: int):
+        self.parser = ET.XMLPullParser(events=('end',))
+        self.budget = budget
+        self.entries = []
+        self.parse_seconds = 0.0
+
+    def feed(self, chunk: bytes) -> bool:
+        started = time.perf_counter()
+        try:
+            self.parser.feed(chunk)
+            for _, elem in self.parser.read_events():
+                if elem.tag in ITEM_TAGS:
+                    self.entries.append(element_entry(elem))
+                    elem.clear()
+                    if len(self.entries) >= self.budget:
+                        return True
+            return False
+        finally:
+            self.parse_seconds += time.perf_counter() - started
+
+
+def fallback_entries(body: bytes, budget: int):
+    # Not well-formed XML: let feedparser's tolerant parser handle the whole body.
+    # Imported here since it is slow to import and rarely needed
+    import feedparser
+    return feedparser.parse(body).entries[:budget]
+
+def read_entries(resp, budget: int):
+    # Returns (entries, bytes read, seconds spent parsing)
+    extractor = ItemExtractor(budget)
+    chunks = []
+    try:
+        while chunk := resp.read(READ_CHUNK_SIZE):
+            chunks.append(chunk)
+            if extractor.feed(chunk):
+                break
+    except ET.ParseError:
+        chunks.append(resp.read())
+        body = b''.join(chunks)
+        started = time.perf_counter()
+        entries = fallback_entries(body, budget)
+        return entries, len(body), extractor.parse_seconds + time.perf_counter() - started
+    return extractor.entries, sum(map(len, chunks)), extractor.parse_seconds
+
+async def stream_entries(body, budget: int):
+    # read_entries over an async iterator of body chunks. Parsing runs in
+    # worker threads so the event loop only moves bytes
+    extractor = ItemExtractor(budget)
+    chunks = []
+    try:
+        async for chunk in body:
+            chunks.append(chunk)
+            if await asyncio.to_thread(extractor.feed, chunk):
+                break
+    except ET.ParseError:
+        async for chunk in body:
+            chunks.append(chunk)
+        whole = b''.join(chunks)
+        entries, seconds = await asyncio.to_thread(timed, fallback_entries, whole, budget)
+        return entries, len(whole), extractor.parse_seconds + seconds
+    return extractor.entries, sum(map(len, chunks)), extractor.parse_seconds
+
+def timed(fn, *args):
+    # Returns (result, seconds spent), measured in the thread that runs fn
+    started = time.perf_counter()
+    return fn(*args), time.perf_counter() - started
+
+def extract_items(spec: FeedSpec, entries, category: str):
+    return [extract_item(spec, entry, category) for entry in entries]
+
+def extract_item(spec: FeedSpec, entry, category: str):
+    raw_desc = entry.get('description', '')
+    if not raw_desc and spec.content_fallback:
+        raw_desc = entry.get('content', [{}])[0].get('value', '')
+    description = raw_desc
+    for step in spec.cleanup_steps:
+        description = step(description)
+    thumbnail = ''
+    for getter in spec.thumbnail_getters:
+        thumbnail = getter(entry, raw_desc)
+        if thumbnail:
+            break
+    pubdate = entry.get('published', '') or entry.get('pubDate', '')
+    dt = parse_date(pubdate)
+    return NewsItem(
+        title=entry.get('title', ''),
+        link=entry.get('link', ''),
+        pubdate=dt.isoformat() if dt else pubdate,
+        description=description,
+        thumbnail_url=thumbnail,
+        category=category,
+        timestamp=dt.timestamp() if dt else 0.0,
+    )
+
+@dataclass(frozen=True)
+class FeedState:
+    etag: str | None
+    modified: str | None
+    items: list
+
+
+class SnapshotFile:
+    # Persists FeedStore entries to SQLite; items are stored as compact JSON rows
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = None
+        self.lock = threading.Lock()
+        self.restoring = None
+
+    def connect(self):
+        if self.conn is None:
+            import sqlite3
+            self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS feeds '
+                '(url TEXT PRIMARY KEY, etag TEXT, modified TEXT, saved_at REAL, items TEXT NOT NULL)'
+            )
+        return self.conn
+
+    def save(self, rss_url: str, etag, modified, items):
+        rows = json.dumps([item.as_row() for item in items], ensure_ascii=False, separators=(',', ':'))
+        with self.lock:
+            try:
+                self.connect().execute(
+                    'INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, ?, ?)',
+                    (rss_url, etag, modified, time.time(), rows),
+                )
+            except Exception:
+                # A read-only or broken file must not fail the fetch
+                pass
+
+    def touch(self, rss_url: str, etag, modified):
+        # A 304 keeps the stored items but counts as a fresh save
+        with self.lock:
+            try:
+                self.connect().execute(
+                    'UPDATE feeds SET saved_at = ?, etag = COALESCE(?, etag), modified = COALESCE(?, modified) '
+                    'WHERE url = ?',
+                    (time.time(), etag, modified, rss_url),
+                )
+            except Exception:
+                pass
+
+    def load(self, max_age: float):
+        # Returns {url: (state, saved_at)} for rows saved within max_age seconds
+        with self.lock:
+            try:
+                rows = self.connect().execute(
+                    'SELECT url, etag, modified, saved_at, items FROM feeds WHERE saved_at >= ?',
+                    (time.time() - max_age,),
+                ).fetchall()
+            except Exception:
+                return {}
+        return {
+            rss_url: (FeedState(etag, modified, [NewsItem(*row) for row in json.loads(items)]), saved_at)
+            for rss_url, etag, modified, saved_at, items in rows
+        }
+
+snapshot_file = SnapshotFile(SNAPSHOT_PATH) if SNAPSHOT_PATH else None
+
+
+class FeedStore:
+    # Validators and last parsed items per feed URL, for conditional GETs
+    def __init__(self):
+        self.feeds = {}
+        self.lock = threading.Lock()
+        self.full = 0
+        self.not_modified = 0
+
+    def get(self, rss_url: str):
+        return self.feeds.get(rss_url)
+
+    def save(self, rss_url: str, etag, modified, items):
+        with self.lock:
+            self.full += 1
+            self.feeds[rss_url] = FeedState(etag, modified, items)
+
+    def reuse(self, rss_url: str, category: str, etag=None, modified=None):
+        # A 304 may carry updated validators; keep the old ones where it does not
+        with self.lock:
+            self.not_modified += 1
+            state = self.feeds[rss_url]
+            if etag or modified:
+                state = FeedState(etag or state.etag, modified or state.modified, state.items)
+                self.feeds[rss_url] = state
+        items = state.items
+        return [item.with_category(category) for item in items]
+
+    def last_items(self, rss_url: str, category: str):
+        state = self.feeds.get(rss_url)
+        return [item.with_category(category) for item in state.items] if state else []
+
+    def stats(self):
+        return {'full': self.full, 'not_modified': self.not_modified}
+
+feed_store = FeedStore()
+
+
+class FeedHealth:
+    def __init__(self):
+        self.state = 'closed'
+        self.failures = 0
+        self.backoff = BREAKER_BACKOFF
+        self.retry_at = 0.0
+        self.last_error = None
+        self.last_latency = None
+
+    def allow(self) -> bool:
+        if self.state == 'closed':
+            return True
+        if self.state == 'open' and time.time() >= self.retry_at:
+            # Let one probe through; the fetch is single-flight per URL
+            self.state = 'half-open'
+            return True
+        return False
+
+    def success(self, latency: float):
+        self.last_latency = latency
+        self.state = 'closed'
+        self.failures = 0
+        self.backoff = BREAKER_BACKOFF
+
+    def failure(self, error: str, latency: float):
+        self.last_latency = latency
+        self.last_error = error
+        self.failures += 1
+        if self.state == 'half-open':
+            self.backoff = min(self.backoff * 2, BREAKER_MAX_BACKOFF)
+        if self.state == 'half-open' or self.failures >= BREAKER_FAILURES:
+            self.state = 'open'
+            self.retry_at = time.time() + self.backoff
+
+    def to_dict(self):
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'last_latency': self.last_latency,
+            'retry_at': datetime.fromtimestamp(self.retry_at, timezone.utc).isoformat() if self.state == 'open' else None,
+        }
+
+feed_health = {}
+
+
+class ParsePool:
+    # Lazily started process pool for CPU-bound parsing
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        with self.lock:
+            if self.executor is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # spawn, since forking a process that already runs threads is unsafe
+                self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self.executor.submit(fn, *args)
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+
+parse_pool = ParsePool(PARSE_WORKERS)
+
+
+class FeedTooLarge(ValueError):
+    pass
+
+
+class FeedClient:
+    # One keep-alive connection pool for every feed fetch, with a per-host
+    # concurrency limit. Both are bound to the event loop that created them
+    def __init__(self, host_connections: int, max_connections: int, keepalive: float, max_bytes: int):
+        self.host_connections = host_connections
+        self.max_connections = max_connections
+        self.keepalive = keepalive
+        self.max_bytes = max_bytes
+        self.client = None
+        self.loop = None
+        self.hosts = {}
+        self.connecting = None
+
+    def bind(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.client = None
+            self.hosts = {}
+            self.connecting = asyncio.Lock()
+            self.loop = loop
+
+    def create_client(self):
+        # Deferred so a process answering from the snapshot file never loads it
+        import httpx
+        return httpx.AsyncClient(
+            timeout=FEED_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_connections, keepalive_expiry=self.keepalive),
+        )
+
+    async def connect(self):
+        self.bind()
+        if self.client is None:
+            async with self.connecting:
+                if self.client is None:
+                    # Importing httpx and loading CA certificates takes ~200 ms,
+                    # too long to block the event loop for
+                    self.client = await asyncio.to_thread(self.create_client)
+        return self.client
+
+    def slot(self, url: str) -> asyncio.Semaphore:
+        # Held around a whole fetch, see guarded_fetch
+        self.bind()
+        host = urlsplit(url).hostname
+        slot = self.hosts.get(host)
+        if slot is None:
+            slot = self.hosts[host] = asyncio.Semaphore(self.host_connections)
+        return slot
+
+    @asynccontextmanager
+    async def stream(self, url: str, headers: dict):
+        client = await self.connect()
+        async with client.stream('GET', url, headers=headers) as resp:
+            yield resp
+
+    async def body(self, resp):
+        # Decompressed body chunks, failing once more than max_bytes were read.
+        # Only what is read counts: a large feed whose first items fit is fine
+        received = 0
+        async for chunk in resp.aiter_bytes(READ_CHUNK_SIZE):
+            received += len(chunk)
+            if received > self.max_bytes:
+                raise FeedTooLarge(f'over {self.max_bytes} bytes')
+            yield chunk
+
+    async def release(self, resp, body):
+        length = resp.headers.get('Content-Length')
+        if not (length and length.isdigit() and int(length) - resp.num_bytes_downloaded <= DRAIN_MAX_BYTES):
+            return
+        try:
+            async for _ in body:
+                pass
+        except FeedTooLarge:
+            pass
+
+    async def aclose(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+feed_client = FeedClient(HOST_CONNECTIONS, HTTP_MAX_CONNECTIONS, HTTP_KEEPALIVE, FEED_MAX_BYTES)
+
+
+def parse_body(source: str, body: bytes, category: str):
+    # Runs in a pool worker; items come back as plain tuples, which pickle compactly.
+    # Returns (entries parsed, item rows, seconds spent parsing)
+    started = time.perf_counter()
+    entries = read_entries(io.BytesIO(body), ITEMS_PER_FEED)[0]
+    rows = [item.as_row() for item in extract_items(FEED_SPECS[source], entries, category)]
+    return len(entries), rows, time.perf_counter() - started
+
+async def parse_feed(source: str, rss_url: str, category: str):
+    spec = FEED_SPECS[source]
+    cached = feed_store.get(rss_url)
+    headers = dict(spec.headers or {})
+    if cached and cached.etag:
+        headers['If-None-Match'] = cached.etag
+    if cached and cached.modified:
+        headers['If-Modified-Since'] = cached.modified
+    async with feed_client.stream(rss_url, headers) as resp:
+        etag = resp.headers.get('ETag')
+        modified = resp.headers.get('Last-Modified')
+        if resp.status_code == 304 and cached:
+            FEED_FETCHES.inc(rss_url, category, 'not_modified')
+            items = feed_store.reuse(rss_url, category, etag, modified)
+            if snapshot_file:
+                # Keeps saved_at current so load() does not expire a feed that only answers 304
+                await asyncio.to_thread(snapshot_file.touch, rss_url, etag, modified)
+            return items
+        resp.raise_for_status()
+        async with aclosing(feed_client.body(resp)) as body:
+            if PARSE_BACKEND == 'process':
+                # Sized by decompressed bytes: Content-Length is missing on chunked
+                # responses and only counts the compressed body under gzip
+                chunks, size = [], 0
+                async for chunk in body:
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size > PARSE_INLINE_MAX_BYTES:
+                        chunks.extend([chunk async for chunk in body])
+                        break
+                payload = b''.join(chunks)
+                if len(payload) > PARSE_INLINE_MAX_BYTES:
+                    parsed = asyncio.wrap_future(parse_pool.submit(parse_body, source, payload, category))
+                else:
+                    parsed = asyncio.to_thread(parse_body, source, payload, category)
+                entries_parsed, rows, parse_seconds = await parsed
+                items = [NewsItem(*row) for row in rows]
+            else:
+                entries, _, parse_seconds = await stream_entries(body, ITEMS_PER_FEED)
+                await feed_client.release(resp, body)
+                items, seconds = await asyncio.to_thread(timed, extract_items, spec, entries, category)
+                parse_seconds += seconds
+                entries_parsed = len(entries)
+        # Bytes received on the wire, drained remainder included
+        body_bytes = resp.num_bytes_downloaded
+    items.sort(key=attrgetter('timestamp'), reverse=True)
+    FEED_PARSE_SECONDS.observe(parse_seconds, rss_url, category)
+    FEED_FETCHES.inc(rss_url, category, 'full')
+    FEED_BYTES.inc(rss_url, category, amount=body_bytes)
+    FEED_ENTRIES_PARSED.inc(rss_url, category, amount=entries_parsed)
+    date_failures = sum(1 for item in items if not item.timestamp and item.pubdate)
+    if date_failures:
+        DATE_PARSE_FAILURES.inc(rss_url, category, amount=date_failures)
+    feed_store.save(rss_url, etag, modified, items)
+    if snapshot_file:
+        # An autocommit SQLite write blocks, so it runs off the event loop
+        await asyncio.to_thread(snapshot_file.save, rss_url, etag, modified, items)
+    return items
 
 sources = {
-    "technology": {
-        "wired_parser": "https://www.wired.com/feed/tag/ai/latest/rss",
-        "techcrunch_parser": "https://techcrunch.com/feed/",
-        "cnbc_parser": "https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=19854910",
-        "firstpost_parser": "https://www.firstpost.com/commonfeeds/v1/mfp/rss/tech.xml",
-        "hindustantimes_parser": "https://www.hindustantimes.com/feeds/rss/technology/rssfeed.xml",
-        "nytimes_parser": "https://rss.nytimes.com/services/xml/rss/nyt/Technology.xml",
-        "mint_parser": "https://www.livemint.com/rss/AI",
-        "mint_parser": "https://www.livemint.com/rss/technology",
-        "ndtv_parser": "https://feeds.feedburner.com/gadgets360-latest",
-        "indianexpress_parser": "https://indianexpress.com/section/technology/feed/",
-        "bbc_parser": "http://feeds.bbci.co.uk/news/technology/rss.xml",
-        "techcrunch_parser": "https://techcrunch.com/feed/"
-    },
-    "sports": {
-        "indiatoday_parser": "https://www.indiatoday.in/rss/1206550",
-        "firstpost_parser": "https://www.firstpost.com/commonfeeds/v1/mfp/rss/sports.xml",
-        "indianexpress_parser": "https://indianexpress.com/section/sports/cricket/feed/",
-        "hindustantimes_parser": "https://www.hindustantimes.com/feeds/rss/sports/rssfeed.xml",
-        "nytimes_parser": "https://rss.nytimes.com/services/xml/rss/nyt/Sports.xml",
-        "mint_parser": "https://www.livemint.com/rss/sports",
-        "ndtv_parser": "https://feeds.feedburner.com/ndtvsports-latest",
-        "indianexpress_parser": "https://indianexpress.com/section/sports/feed/",
-        "toi_parser": "http://timesofindia.indiatimes.com/rssfeeds/54829575.cms",
-        "toi_parser": "http://timesofindia.indiatimes.com/rssfeeds/4719148.cms",
-        "thehindu_parser": "https://www.thehindu.com/sport/cricket/feeder/default.rss",
-        "thehindu_parser": "https://www.thehindu.com/sport/other-sports/feeder/default.rss"
-    },
-    "business": {
-        "wired_parser": "https://www.wired.com/feed/category/business/latest/rss",
-        "cnbc_parser": "https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=10001147",
-        "firstpost_parser": "https://www.firstpost.com/commonfeeds/v1/mfp/rss/business.xml",
-        "hindustantimes_parser": "https://www.hindustantimes.com/feeds/rss/business/rssfeed.xml",
-        "nytimes_parser": "https://rss.nytimes.com/services/xml/rss/nyt/Business.xml",
-        "nytimes_parser": "https://rss.nytimes.com/services/xml/rss/nyt/SmallBusiness.xml",
-        "mint_parser": "https://www.livemint.com/rss/companies",
-        "mint_parser": "https://www.livemint.com/rss/markets",
-        "ndtv_parser": "https://feeds.feedburner.com/ndtvprofit-latest",
-        "toi_parser": "http://timesofindia.indiatimes.com/rssfeeds/1898055.cms",
-        "thehindu_parser": "https://www.thehindu.com/business/agri-business/feeder/default.rss",
-        "thehindu_parser": "https://www.thehindu.com/business/Industry/feeder/default.rss",
-        "thehindu_parser": "https://www.thehindu.com/business/Economy/feeder/default.rss",
-        "bbc_parser": "http://feeds.bbci.co.uk/news/business/rss.xml"
-    },
-    "science": {
-        "wired_parser": "https://www.wired.com/feed/category/science/latest/rss",
-        "hindustantimes_parser": "https://www.hindustantimes.com/feeds/rss/science/rssfeed.xml",
-        "nytimes_parser": "https://rss.nytimes.com/services/xml/rss/nyt/Science.xml",
-        "nytimes_parser": "https://rss.nytimes.com/services/xml/rss/nyt/Climate.xml",
-        "nytimes_parser": "https://rss.nytimes.com/services/xml/rss/nyt/Space.xml",
-        "mint_parser": "https://www.livemint.com/rss/science",
-        "indianexpress_parser": "https://indianexpress.com/section/technology/science/feed/",
-        "toi_parser": "http://timesofindia.indiatimes.com/rssfeeds/-2128672765.cms",
-        "bbc_parser": "http://feeds.bbci.co.uk/news/science_and_environment/rss.xml"
-    },
-    "health": {
-        "bbc_parser": "http://feeds.bbci.co.uk/news/health/rss.xml",
-        "indianexpress_parser": "https://indianexpress.com/section/lifestyle/health/feed/",
-        "indianexpress_parser": "https://indianexpress.com/section/health-wellness/feed/",
-        "ndtv_parser": "https://feeds.feedburner.com/ndtvcooks-latest",
-        "nytimes_parser": "https://rss.nytimes.com/services/xml/rss/nyt/Health.xml",
-        "nytimes_parser": "https://rss.nytimes.com/services/xml/rss/nyt/Well.xml",
-        "hindustantimes_parser": "https://www.hindustantimes.com/feeds/rss/lifestyle/health/rssfeed.xml",
-        "firstpost_parser": "https://www.firstpost.com/commonfeeds/v1/mfp/rss/health.xml",
-        "cnbc_parser": "https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=10000108"
-    },
-    "entertainment": {
-        "firstpost_parser": "https://www.firstpost.com/commonfeeds/v1/mfp/rss/entertainment.xml",
-        "hindustantimes_parser": "https://www.hindustantimes.com/feeds/rss/entertainment/rssfeed.xml",
-        "hindustantimes_parser": "https://www.hindustantimes.com/feeds/rss/entertainment/bollywood/rssfeed.xml",
-        "hindustantimes_parser": "https://www.hindustantimes.com/feeds/rss/entertainment/music/rssfeed.xml",
-        "hindustantimes_parser": "https://www.hindustantimes.com/feeds/rss/entertainment/hollywood/rssfeed.xml",
-        "indianexpress_parser": "https://indianexpress.com/section/entertainment/bigg-boss/feed/",
-        "indianexpress_parser": "https://indianexpress.com/section/entertainment/feed/",
-        "indianexpress_parser": "https://indianexpress.com/section/entertainment/movie-review/feed/",
-        "toi_parser": "http://timesofindia.indiatimes.com/rssfeeds/1081479906.cms",
-        "bbc_parser": "http://feeds.bbci.co.uk/news/entertainment_and_arts/rss.xml",
-        "thehindu_parser": "https://www.thehindu.com/entertainment/art/feeder/default.rss",
-        "thehindu_parser": "https://www.thehindu.com/entertainment/dance/feeder/default.rss"
+    "technology": [
+        ("wired", "https://www.wired.com/feed/tag/ai/latest/rss"),
+        ("techcrunch", "https://techcrunch.com/feed/"),
+        ("cnbc", "https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=19854910"),
+        ("firstpost", "https://www.firstpost.com/commonfeeds/v1/mfp/rss/tech.xml"),
+        ("hindustantimes", "https://www.hindustantimes.com/feeds/rss/technology/rssfeed.xml"),
+        ("nytimes", "https://rss.nytimes.com/services/xml/rss/nyt/Technology.xml"),
+        ("mint", "https://www.livemint.com/rss/AI"),
+        ("mint", "https://www.livemint.com/rss/technology"),
+        ("ndtv", "https://feeds.feedburner.com/gadgets360-latest"),
+        ("indianexpress", "https://indianexpress.com/section/technology/feed/"),
+        ("bbc", "http://feeds.bbci.co.uk/news/technology/rss.xml")
+    ],
+    "sports": [
+        ("indiatoday", "https://www.indiatoday.in/rss/1206550"),
+        ("firstpost", "https://www.firstpost.com/commonfeeds/v1/mfp/rss/sports.xml"),
+        ("indianexpress", "https://indianexpress.com/section/sports/cricket/feed/"),
+        ("hindustantimes", "https://www.hindustantimes.com/feeds/rss/sports/rssfeed.xml"),
+        ("nytimes", "https://rss.nytimes.com/services/xml/rss/nyt/Sports.xml"),
+        ("mint", "https://www.livemint.com/rss/sports"),
+        ("ndtv", "https://feeds.feedburner.com/ndtvsports-latest"),
+        ("indianexpress", "https://indianexpress.com/section/sports/feed/"),
+        ("toi", "http://timesofindia.indiatimes.com/rssfeeds/54829575.cms"),
+        ("toi", "http://timesofindia.indiatimes.com/rssfeeds/4719148.cms"),
+        ("thehindu", "https://www.thehindu.com/sport/cricket/feeder/default.rss"),
+        ("thehindu", "https://www.thehindu.com/sport/other-sports/feeder/default.rss")
+    ],
+    "business": [
+        ("wired", "https://www.wired.com/feed/category/business/latest/rss"),
+        ("cnbc", "https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=10001147"),
+        ("firstpost", "https://www.firstpost.com/commonfeeds/v1/mfp/rss/business.xml"),
+        ("hindustantimes", "https://www.hindustantimes.com/feeds/rss/business/rssfeed.xml"),
+        ("nytimes", "https://rss.nytimes.com/services/xml/rss/nyt/Business.xml"),
+        ("nytimes", "https://rss.nytimes.com/services/xml/rss/nyt/SmallBusiness.xml"),
+        ("mint", "https://www.livemint.com/rss/companies"),
+        ("mint", "https://www.livemint.com/rss/markets"),
+        ("ndtv", "https://feeds.feedburner.com/ndtvprofit-latest"),
+        ("toi", "http://timesofindia.indiatimes.com/rssfeeds/1898055.cms"),
+        ("thehindu", "https://www.thehindu.com/business/agri-business/feeder/default.rss"),
+        ("thehindu", "https://www.thehindu.com/business/Industry/feeder/default.rss"),
+        ("thehindu", "https://www.thehindu.com/business/Economy/feeder/default.rss"),
+        ("bbc", "http://feeds.bbci.co.uk/news/business/rss.xml")
+    ],
+    "science": [
+        ("wired", "https://www.wired.com/feed/category/science/latest/rss"),
+        ("hindustantimes", "https://www.hindustantimes.com/feeds/rss/science/rssfeed.xml"),
+        ("nytimes", "https://rss.nytimes.com/services/xml/rss/nyt/Science.xml"),
+        ("nytimes", "https://rss.nytimes.com/services/xml/rss/nyt/Climate.xml"),
+        ("nytimes", "https://rss.nytimes.com/services/xml/rss/nyt/Space.xml"),
+        ("mint", "https://www.livemint.com/rss/science"),
+        ("indianexpress", "https://indianexpress.com/section/technology/science/feed/"),
+        ("toi", "http://timesofindia.indiatimes.com/rssfeeds/-2128672765.cms"),
+        ("bbc", "http://feeds.bbci.co.uk/news/science_and_environment/rss.xml")
+    ],
+    "health": [
+        ("bbc", "http://feeds.bbci.co.uk/news/health/rss.xml"),
+        ("indianexpress", "https://indianexpress.com/section/lifestyle/health/feed/"),
+        ("indianexpress", "https://indianexpress.com/section/health-wellness/feed/"),
+        ("ndtv", "https://feeds.feedburner.com/ndtvcooks-latest"),
+        ("nytimes", "https://rss.nytimes.com/services/xml/rss/nyt/Health.xml"),
+        ("nytimes", "https://rss.nytimes.com/services/xml/rss/nyt/Well.xml"),
+        ("hindustantimes", "https://www.hindustantimes.com/feeds/rss/lifestyle/health/rssfeed.xml"),
+        ("firstpost", "https://www.firstpost.com/commonfeeds/v1/mfp/rss/health.xml"),
+        ("cnbc", "https://search.cnbc.com/rs/search/combinedcms/view.xml?partnerId=wrss01&id=10000108")
+    ],
+    "entertainment": [
+        ("firstpost", "https://www.firstpost.com/commonfeeds/v1/mfp/rss/entertainment.xml"),
+        ("hindustantimes", "https://www.hindustantimes.com/feeds/rss/entertainment/rssfeed.xml"),
+        ("hindustantimes", "https://www.hindustantimes.com/feeds/rss/entertainment/bollywood/rssfeed.xml"),
+        ("hindustantimes", "https://www.hindustantimes.com/feeds/rss/entertainment/music/rssfeed.xml"),
+        ("hindustantimes", "https://www.hindustantimes.com/feeds/rss/entertainment/hollywood/rssfeed.xml"),
+        ("indianexpress", "https://indianexpress.com/section/entertainment/bigg-boss/feed/"),
+        ("indianexpress", "https://indianexpress.com/section/entertainment/feed/"),
+        ("indianexpress", "https://indianexpress.com/section/entertainment/movie-review/feed/"),
+        ("toi", "http://timesofindia.indiatimes.com/rssfeeds/1081479906.cms"),
+        ("bbc", "http://feeds.bbci.co.uk/news/entertainment_and_arts/rss.xml"),
+        ("thehindu", "https://www.thehindu.com/entertainment/art/feeder/default.rss"),
+        ("thehindu", "https://www.thehindu.com/entertainment/dance/feeder/default.rss")
+    ]
+}
+
+
+# In-flight fetches by feed URL, so a feed registered in several categories
+# is downloaded once when those categories load together
+feed_inflight = {}
+
+async def guarded_fetch(source: str, rss_url: str, category: str):
+    health = feed_health.setdefault(rss_url, FeedHealth())
+    if not health.allow():
+        # Breaker open: serve the last good items instead of waiting on the feed
+        FEED_FETCHES.inc(rss_url, category, 'skipped')
+        return feed_store.last_items(rss_url, category)
+    # Waiting for a per-host slot is queueing on our side, not publisher
+    # latency, so the timeout and latency clock start once the slot is held
+    async with feed_client.slot(rss_url):
+        started = time.monotonic()
+        try:
+            items = await asyncio.wait_for(parse_feed(source, rss_url, category), FEED_TIMEOUT)
+        except Exception as e:
+            latency = time.monotonic() - started
+            health.failure(f'{type(e).__name__}: {e}', latency)
+            FEED_FETCHES.inc(rss_url, category, 'error')
+            FEED_FETCH_SECONDS.observe(latency, rss_url, category)
+            raise
+        latency = time.monotonic() - started
+    FEED_FETCH_SECONDS.observe(latency, rss_url, category)
+    if latency > FEED_LATENCY_BUDGET:
+        health.failure(f'slow: {latency:.2f}s', latency)
+    else:
+        health.success(latency)
+    return items
+
+def shared_fetch(source: str, rss_url: str, category: str):
+    task = feed_inflight.get(rss_url)
+    if task is None:
+        task = asyncio.create_task(guarded_fetch(source, rss_url, category))
+        feed_inflight[rss_url] = task
+        task.add_done_callback(lambda t: forget_fetch(rss_url, t))
+    return task
+
+def forget_fetch(rss_url: str, task):
+    feed_inflight.pop(rss_url, None)
+    if not task.cancelled():
+        task.exception()
+
+async def run_parser(source: str, rss_url: str, category: str):
+    # shield so a caller hitting its deadline does not cancel the fetch for the others
+    items = await asyncio.shield(shared_fetch(source, rss_url, category))
+    items = [item.with_category(category) for item in items]
+    search_index.add(items)
+    return items
+
+async def fetch_category(category: str):
+    # Fetch every feed of the category at once; feeds that fail, time out or
+    # miss the category deadline are left out of the response.
+    # Returns one newest-first list per feed URL
+    tasks = {asyncio.create_task(run_parser(source, url, category)): url for source, url in sources[category]}
+    if not tasks:
+        return {}
+    done, pending = await asyncio.wait(tasks, timeout=CATEGORY_DEADLINE)
+    for task in pending:
+        task.cancel()
+    return {
+        tasks[task]: task.result() for task in done
+        if not task.cancelled() and task.exception() is None
     }
+
+
+class ResponseCache:
+    def __init__(self, loader, ttl: float, stale_ttl: float, max_entries: int):
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.inflight = {}
+
+    def peek(self, key):
+        # The cached value while it may still be served, else None.
+        # Schedules a refresh when the value is stale
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        built_at, value = entry
+        age = time.monotonic() - built_at
+        if age >= self.ttl + self.stale_ttl:
+            return None
+        self.entries.move_to_end(key)
+        if age >= self.ttl:
+            CACHE_REQUESTS.inc(key, 'stale')
+            self.refresh(key)
+        else:
+            CACHE_REQUESTS.inc(key, 'fresh')
+        return value
+
+    async def get(self, key):
+        value = self.peek(key)
+        if value is not None:
+            return value
+        CACHE_REQUESTS.inc(key, 'miss')
+        # shield so a disconnecting client does not cancel the shared load
+        return await asyncio.shield(self.refresh(key))
+
+    def refresh(self, key):
+        # Concurrent misses for the same key share one load
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self.load(key))
+            self.inflight[key] = task
+            task.add_done_callback(lambda t: self.done(key, t))
+        return task
+
+    def done(self, key, task):
+        self.inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+
+    async def load(self, key):
+        value = await self.loader(key)
+        # Do not pin an empty result when every feed failed
+        if value:
+            self.put(key, value)
+        return value
+
+    def put(self, key, value, age: float = 0.0):
+        # `age` backdates a value built earlier, e.g. one restored from disk
+        self.entries[key] = (time.monotonic() - age, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+def build_category(runs):
+    news_items, duplicates = dedupe(merge_newest(runs.values()))
+    return build_snapshot(news_items, duplicates)
+
+async def load_category(category: str):
+    runs = await fetch_category(category)
+    snapshot = build_category(runs)
+    owners = {id(item): rss_url for rss_url, items in runs.items() for item in items}
+    for rss_url, kept in Counter(owners[id(item)] for item in snapshot.items).items():
+        FEED_ITEMS_KEPT.inc(rss_url, category, amount=kept)
+    return snapshot
+
+category_cache = ResponseCache(load_category, CACHE_TTL, CACHE_STALE_TTL, CACHE_MAX_ENTRIES)
+
+
+class Prewarmer:
+    def __init__(self):
+        self.snapshots = {}
+        self.ready = {category: asyncio.Event() for category in sources}
+        self.tasks = []
+
+    def start(self):
+        self.tasks = [asyncio.create_task(self.run(category)) for category in sources]
+
+    def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+    async def run(self, category: str):
+        interval = REFRESH_INTERVALS.get(category, REFRESH_INTERVAL)
+        while True:
+            try:
+                snapshot = await load_category(category)
+            except Exception:
+                snapshot = EMPTY_SNAPSHOT
+            # Keep serving the previous snapshot when every feed failed
+            if snapshot:
+                self.snapshots[category] = snapshot
+            self.ready[category].set()
+            # Jitter so categories sharing publishers do not refresh in lockstep
+            await asyncio.sleep(interval * random.uniform(1 - REFRESH_JITTER, 1 + REFRESH_JITTER))
+
+    async def get(self, category: str):
+        await self.ready[category].wait()
+        return self.snapshots.get(category, EMPTY_SNAPSHOT)
+
+    def built_at(self):
+        return {
+            category: datetime.fromtimestamp(snapshot.built_at, timezone.utc).isoformat()
+            for category, snapshot in self.snapshots.items()
+        }
+
+prewarmer = Prewarmer()
+
+
+# Full-text search over fetched items
+SEARCH_TITLE_BOOST = 3
+COMBINING_RE = re.compile(r'[\u0300-\u036f]')
+# Words nearly every item contains; left out so a query never walks all of them
+SEARCH_STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'were', 'will', 'with',
 }
 
+def search_terms(text: str):
+    words = TITLE_WORD_RE.findall(COMBINING_RE.sub('', unicodedata.normalize('NFKD', text)).lower())
+    return [word for word in words if word not in SEARCH_STOPWORDS]
+
+@dataclass(slots=True)
+class SearchDoc:
+    item: NewsItem
+    categories: set
+    terms: tuple
+    expires_from: float
+
+
+class SearchIndex:
+    # Inverted index over title and description, updated as feeds are fetched.
+    # Keyed by canonical link, so a feed seen again only touches its new items
+    def __init__(self, retention: float):
+        self.retention = retention
+        self.docs = {}
+        self.postings = {}
+        self.expiry = []
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, news_items):
+        now = time.time()
+        cutoff = now - self.retention
+        for item in news_items:
+            key = canonical_link(item.link) if item.link else item.title
+            doc = self.docs.get(key)
+            if doc is not None:
+                doc.categories.add(item.category)
+                continue
+            expires_from = item.timestamp or now
+            if not key or expires_from < cutoff:
+                continue
+            weights = Counter(search_terms(item.title))
+            for term in weights:
+                weights[term] *= SEARCH_TITLE_BOOST
+            weights.update(search_terms(TAG_RE.sub(' ', item.description)))
+            self.docs[key] = SearchDoc(item, {item.category}, tuple(weights), expires_from)
+            for term, weight in weights.items():
+                self.postings.setdefault(term, {})[key] = weight
+            heapq.heappush(self.expiry, (expires_from, key))
+        self.evict(cutoff)
+
+    def evict(self, cutoff: float):
+        while self.expiry and self.expiry[0][0] < cutoff:
+            _, key = heapq.heappop(self.expiry)
+            doc = self.docs.pop(key)
+            for term in doc.terms:
+                postings = self.postings[term]
+                del postings[key]
+                if not postings:
+                    del self.postings[term]
+
+    def search(self, query: str, categories=(), limit: int = 10):
+        # tf-idf ranking with title matches boosted, newer first on ties.
+        # Copies of one story under different links are returned once
+        self.evict(time.time() - self.retention)
+        scores = {}
+        for term in set(search_terms(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + len(self.docs) / len(postings))
+            for key, weight in postings.items():
+                scores[key] = scores.get(key, 0.0) + idf * weight
+        if categories:
+            scores = {key: score for key, score in scores.items() if not self.docs[key].categories.isdisjoint(categories)}
+        def rank(key):
+            return scores[key], self.docs[key].item.timestamp
+        # Usually the top few suffice; sort everything only when duplicates thinned them out
+        results = self.collect(heapq.nlargest(2 * limit, scores, key=rank), categories, limit)
+        if len(results) < limit and len(scores) > 2 * limit:
+            results = self.collect(sorted(scores, key=rank, reverse=True), categories, limit)
+        return results
+
+    def collect(self, ranked, categories, limit: int):
+        seen = DedupIndex()
+        results = []
+        for key in ranked:
+            doc = self.docs[key]
+            item = doc.item
+            if categories and item.category not in categories:
+                item = item.with_category(next(name for name in categories if name in doc.categories))
+            if seen.add(item):
+                results.append(item)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def stats(self):
+        return {'items': len(self.docs), 'terms': len(self.postings)}
+
+search_index = SearchIndex(SEARCH_RETENTION)
+
+
+async def restore_snapshot_file():
+    # Rows past the stale window are not worth serving and are skipped
+    rows = await asyncio.to_thread(snapshot_file.load, CACHE_TTL + CACHE_STALE_TTL)
+    for rss_url, (state, _) in rows.items():
+        feed_store.feeds.setdefault(rss_url, state)
+    for category, feeds in sources.items():
+        runs = {url: feed_store.last_items(url, category) for _, url in feeds if url in rows}
+        if not runs:
+            continue
+        for items in runs.values():
+            search_index.add(items)
+        # As old as its oldest feed, so the cache serves it fresh or stale by its real age
+        saved_at = min(rows[url][1] for url in runs)
+        snapshot = replace(build_category(runs), built_at=saved_at)
+        category_cache.put(category, snapshot, age=max(time.time() - saved_at, 0.0))
+        if PREWARM and category not in prewarmer.snapshots:
+            prewarmer.snapshots[category] = snapshot
+            prewarmer.ready[category].set()
+
+async def restore_once():
+    # The snapshot file is read once, on the first request
+    if snapshot_file:
+        if snapshot_file.restoring is None:
+            snapshot_file.restoring = asyncio.create_task(restore_snapshot_file())
+        await asyncio.shield(snapshot_file.restoring)
+
+async def get_category_snapshot(category: str):
+    await restore_once()
+    if PREWARM:
+        return await prewarmer.get(category)
+    return await category_cache.get(category)
+
+
+# NDJSON streaming: one item per line, then a trailer line
+# {"order": [...], "duplicates": n, "cursor": ...} where order lists the line
+# numbers of the merged newest-first top `limit` items
+def ndjson_trailer(order, duplicates: int, cursor: str | None) -> bytes:
+    return json.dumps({'order': order, 'duplicates': duplicates, 'cursor': cursor}).encode('utf-8') + b'\n'
+
+async def stream_snapshot(snapshot: CategorySnapshot, limit: int, since: str | None):
+    start, stop, next_cursor = select_window(snapshot, limit, since)
+    encoded = snapshot.encoded[start:stop]
+    yield b''.join(line + b'\n' for line in encoded) + ndjson_trailer(list(range(len(encoded))), snapshot.duplicates, next_cursor)
+
+async def stream_feeds(category: str, limit: int, since: str | None):
+    # Items are written as each feed completes, deduplicated in arrival order
+    since_ts = decode_since(since) if since is not None else None
+    tasks = {asyncio.create_task(run_parser(source, url, category)): url for source, url in sources[category]}
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + CATEGORY_DEADLINE
+    pending = set(tasks)
+    index = DedupIndex()
+    emitted = []
+    runs = {}
+    try:
+        while pending and loop.time() < deadline:
+            done, pending = await asyncio.wait(pending, timeout=deadline - loop.time(), return_when=asyncio.FIRST_COMPLETED)
+            lines = []
+            for task in done:
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                runs[tasks[task]] = task.result()
+                for item in task.result():
+                    if since_ts is not None and item.timestamp <= since_ts:
+                        continue
+                    if index.add(item):
+                        emitted.append(item)
+                        lines.append(item.encode() + b'\n')
+            if lines:
+                yield b''.join(lines)
+    finally:
+        for task in pending:
+            task.cancel()
+    # Later non-streaming requests can reuse what was just fetched
+    snapshot = build_category(runs)
+    if snapshot:
+        category_cache.put(category, snapshot)
+    order = heapq.nlargest(limit, range(len(emitted)), key=lambda i: emitted[i].timestamp)
+    newest = emitted[order[0]].timestamp if order else since_ts
+    yield ndjson_trailer(order, index.duplicates, encode_cursor(newest) if newest is not None else None)
+
+async def serve_category(category: str, request: Request, limit: int, since: str | None, stream: str | None):
+    check_limit(limit)
+    if stream is None:
+        snapshot = await get_category_snapshot(category)
+        return category_response(snapshot, limit, since, request.headers.get('if-none-match'))
+    if stream != 'ndjson':
+        raise HTTPException(status_code=400, detail='stream must be "ndjson"')
+    if since is not None:
+        decode_since(since)
+    await restore_once()
+    snapshot = await prewarmer.get(category) if PREWARM else category_cache.peek(category)
+    body = stream_snapshot(snapshot, limit, since) if snapshot is not None else stream_feeds(category, limit, since)
+    return StreamingResponse(body, media_type='application/x-ndjson')
+
 
 # Category endpoints
 @app.get("/technology")
-async def get_technology(limit: int = 10):
-    news_items = []
-    for parser_name, url in sources["technology"].items():
-        parser = globals().get(parser_name)
-        if parser:
-            news_items.extend(parser(url, "technology"))
-    # Sort by pubdate descending
-    news_items.sort(key=lambda x: x['pubdate'], reverse=True)
-    return news_items[:limit]
+async def get_technology(request: Request, limit: int = 10, since: str | None = None, stream: str | None = None):
+    return await serve_category("technology", request, limit, since, stream)
 
 @app.get("/sports")
-async def get_sports(limit: int = 10):
-    news_items = []
-    for parser_name, url in sources["sports"].items():
-        parser = globals().get(parser_name)
-        if parser:
-            news_items.extend(parser(url, "sports"))
-    news_items.sort(key=lambda x: x['pubdate'], reverse=True)
-    return news_items[:limit]
+async def get_sports(request: Request, limit: int = 10, since: str | None = None, stream: str | None = None):
+    return await serve_category("sports", request, limit, since, stream)
 
 @app.get("/business")
-async def get_business(limit: int = 10):
-    news_items = []
-    for parser_name, url in sources["business"].items():
-        parser = globals().get(parser_name)
-        if parser:
-            news_items.extend(parser(url, "business"))
-    news_items.sort(key=lambda x: x['pubdate'], reverse=True)
-    return news_items[:limit]
+async def get_business(request: Request, limit: int = 10, since: str | None = None, stream: str | None = None):
+    return await serve_category("business", request, limit, since, stream)
 
 @app.get("/science")
-async def get_science(limit: int = 10):
-    news_items = []
-    for parser_name, url in sources["science"].items():
-        parser = globals().get(parser_name)
-        if parser:
-            news_items.extend(parser(url, "science"))
-    news_items.sort(key=lambda x: x['pubdate'], reverse=True)
-    return news_items[:limit]
+async def get_science(request: Request, limit: int = 10, since: str | None = None, stream: str | None = None):
+    return await serve_category("science", request, limit, since, stream)
 
 @app.get("/health")
-async def get_health(limit: int = 10):
-    news_items = []
-    for parser_name, url in sources["health"].items():
-        parser = globals().get(parser_name)
-        if parser:
-            news_items.extend(parser(url, "health"))
-    news_items.sort(key=lambda x: x['pubdate'], reverse=True)
-    return news_items[:limit]
+async def get_health(request: Request, limit: int = 10, since: str | None = None, stream: str | None = None):
+    return await serve_category("health", request, limit, since, stream)
 
 @app.get("/entertainment")
-async def get_entertainment(limit: int = 10):
-    news_items = []
-    for parser_name, url in sources["entertainment"].items():
-        parser = globals().get(parser_name)
-        if parser:
-            news_items.extend(parser(url, "entertainment"))
-    news_items.sort(key=lambda x: x['pubdate'], reverse=True)
-    return news_items[:limit]
+async def get_entertainment(request: Request, limit: int = 10, since: str | None = None, stream: str | None = None):
+    return await serve_category("entertainment", request, limit, since, stream)
+
+
+def parse_limits(limits: str):
+    # "technology:5,sports:20" -> {"technology": 5, "sports": 20}
+    parsed = {}
+    for pair in limits.split(','):
+        if not pair.strip():
+            continue
+        name, _, value = pair.partition(':')
+        name, value = name.strip(), value.strip()
+        if not name or not value.lstrip('-').isdigit():
+            raise HTTPException(status_code=400, detail=f'limits entry {pair.strip()!r} is not category:count')
+        check_limit(int(value), f'limit for {name}')
+        parsed[name] = int(value)
+    return parsed
+
+@app.get("/batch")
+async def get_batch(categories: str = ",".join(sources), limit: int = 10, limits: str = ""):
+    check_limit(limit)
+    requested = list(dict.fromkeys(name.strip() for name in categories.split(',') if name.strip()))
+    category_limits = parse_limits(limits)
+    known = [name for name in requested if name in sources]
+    # Categories load concurrently; a failing one only errors its own entry
+    snapshots = await asyncio.gather(*(get_category_snapshot(name) for name in known), return_exceptions=True)
+    results = dict(zip(known, snapshots))
+    parts = []
+    for name in requested:
+        snapshot = results.get(name)
+        if name not in sources:
+            error = 'unknown category'
+        elif isinstance(snapshot, BaseException):
+            error = f'failed to load category: {snapshot}'
+        elif not snapshot:
+            error = 'no feeds responded'
+        else:
+            error = None
+        key = json.dumps(name).encode('utf-8')
+        if error:
+            parts.append(key + b':{"items":[],"duplicates":0,"error":' + json.dumps(error).encode('utf-8') + b'}')
+            continue
+        encoded = snapshot.encoded[:category_limits.get(name, limit)]
+        parts.append(key + b':{"items":[' + b','.join(encoded) + b'],"duplicates":' + str(snapshot.duplicates).encode('ascii') + b'}')
+    return Response(b'{' + b','.join(parts) + b'}', media_type='application/json')
+
+
+@app.get("/search")
+async def search(q: str, category: str = "", limit: int = 10):
+    # Answered from the in-memory index only, never from the network
+    check_limit(limit)
+    categories = list(dict.fromkeys(name.strip() for name in category.split(',') if name.strip()))
+    unknown = [name for name in categories if name not in sources]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f'unknown category: {", ".join(unknown)}')
+    if not search_terms(q):
+        raise HTTPException(status_code=400, detail='q has no searchable words')
+    await restore_once()
+    results = search_index.search(q, categories, limit)
+    return json_response([item.encode() for item in results])
+
+
+@app.get("/metrics")
+async def get_metrics():
+    lines = [line for metric in METRICS for line in metric.render()]
+    return PlainTextResponse('\n'.join(lines) + '\n', media_type='text/plain; version=0.0.4')
+
+
+@app.get("/feeds")
+async def get_feeds():
+    return {rss_url: health.to_dict() for rss_url, health in feed_health.items()}
 
 
 @app.get("/")
 async def read_root():
-    return {"message": "API is up!"}
+    return {"message": "API is up!", "feeds": feed_store.stats(), "snapshots": prewarmer.built_at(), "search": search_index.stats()}
 
@@ -0,0 +1,86 @@
+"""End-to-end category endpoint load test through the ASGI app.
+
+Feeds are served by the local FeedServer, so no network is needed.
+Run from NewsAPI/:  python benchmarks/bench_endpoints.py --concurrency 16 --requests 300
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def run(index, args):
+    import httpx
+
+    categories = args.categories.split(',') if args.categories else list(index.sources)
+    latencies = []
+    statuses = {}
+    queue = asyncio.Queue()
+    for n in range(args.requests):
+        queue.put_nowait(categories[n % len(categories)])
+
+    async def worker(client):
+        while not queue.empty():
+            category = queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.get(f'/{category}', params={'limit': args.limit})
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, statuses, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=120)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--categories', default='', help='comma-separated, defaults to all')
+    parser.add_argument('--latency', type=float, default=0.02, help='injected feed latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.02, help='extra random feed latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of feed requests answered with 500')
+    parser.add_argument('--not-modified', action='store_true', help='send ETags and answer revalidations with 304')
+    parser.add_argument('--cache', action='store_true', help='keep the category cache on (default measures the fetch pipeline)')
+    parser.add_argument('--parse-backend', choices=('thread', 'process'), default='thread')
+    parser.add_argument('--host-connections', type=int, default=64,
+                        help='per-host request limit; every stand-in feed shares one host')
+    args = parser.parse_args()
+
+    # Read by index.py at import time
+    if not args.cache:
+        os.environ['CACHE_TTL'] = '0'
+        os.environ['CACHE_STALE_TTL'] = '0'
+    os.environ['PREWARM'] = '0'
+    os.environ['PARSE_BACKEND'] = args.parse_backend
+    os.environ['HOST_CONNECTIONS'] = str(args.host_connections)
+
+    import index
+    from feed_server import FeedServer, use_feed_server
+
+    with FeedServer(args.latency, args.jitter, args.error_rate, args.not_modified) as server:
+        use_feed_server(index, server)
+        latencies, statuses, elapsed = asyncio.run(run(index, args))
+        counts = dict(server.counts)
+    index.parse_pool.shutdown()
+
+    print(f'requests     {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.1f} req/s), statuses {statuses}')
+    print(f'latency      p50 {percentile(latencies, 0.5) * 1e3:.1f} ms  p99 {percentile(latencies, 0.99) * 1e3:.1f} ms  max {max(latencies) * 1e3:.1f} ms')
+    print(f'feed server  {counts}')
+    print(f'feed store   {index.feed_store.stats()}')
+
+
+if __name__ == '__main__':
+    main()
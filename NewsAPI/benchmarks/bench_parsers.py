@@ -0,0 +1,66 @@
+"""Parser microbenchmarks over the fixture feeds, no network involved.
+
+Run from NewsAPI/:  python benchmarks/bench_parsers.py [--feedparser]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+import fixtures
+from index import FEED_SPECS, ITEMS_PER_FEED, extract_item, read_entries
+
+
+def parse_streaming(name: str, body: bytes):
+    entries = read_entries(io.BytesIO(body), ITEMS_PER_FEED)[0]
+    return [extract_item(FEED_SPECS[fixtures.spec_source(name)], entry, 'bench') for entry in entries]
+
+
+def parse_feedparser(name: str, body: bytes):
+    # The pre-streaming path: build the whole document, keep the first items
+    import feedparser
+    entries = feedparser.parse(body).entries[:ITEMS_PER_FEED]
+    return [extract_item(FEED_SPECS[fixtures.spec_source(name)], entry, 'bench') for entry in entries]
+
+
+def measure(parse, source: str, body: bytes, min_time: float):
+    items = parse(source, body)
+    rounds = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < min_time:
+        parse(source, body)
+        rounds += 1
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    kept = parse(source, body)
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Blocks still alive once the parse returned, i.e. the items handed back
+    blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+    del kept
+    return len(items) * rounds / elapsed, elapsed / rounds, peak, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--feedparser', action='store_true', help='also measure the full feedparser path')
+    parser.add_argument('--min-time', type=float, default=0.5, help='seconds to run each source')
+    args = parser.parse_args()
+
+    paths = [('stream', parse_streaming)]
+    if args.feedparser:
+        paths.append(('feedparser', parse_feedparser))
+    print(f'{"source":15} {"path":10} {"bytes":>8} {"items/s":>10} {"ms/feed":>8} {"peak KiB":>9} {"kept blocks":>11}')
+    for source, body in fixtures.load_all().items():
+        for name, parse in paths:
+            rate, per_feed, peak, blocks = measure(parse, source, body, args.min_time)
+            print(f'{source:15} {name:10} {len(body):8} {rate:10.0f} {per_feed * 1e3:8.2f} {peak / 1024:9.1f} {blocks:11}')
+
+
+if __name__ == '__main__':
+    main()
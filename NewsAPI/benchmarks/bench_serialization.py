@@ -0,0 +1,61 @@
+"""Compare the NewsItem + pre-encoded path with the old dict + FastAPI path.
+
+Run from NewsAPI/:  python benchmarks/bench_serialization.py
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from index import NewsItem, build_snapshot, json_response
+
+ITEMS = 1000
+LIMIT = 10
+ROUNDS = 2000
+
+
+def make_fields(i: int):
+    return {
+        'title': f'Headline number {i} about something newsworthy',
+        'link': f'https://www.example.com/news/{i}/some-article-slug',
+        'pubdate': '2025-08-22T12:00:00+00:00',
+        'description': 'A short summary of the article that a publisher put in its feed. ' * 3,
+        'thumbnail_url': f'https://img.example.com/{i}.jpg',
+        'category': 'technology',
+    }
+
+
+def bytes_per_item(factory) -> float:
+    fields = [make_fields(i) for i in range(ITEMS)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    items = [factory(f) for f in fields]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    # Only the container objects, the field strings are shared by both paths
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del items
+    return size / ITEMS
+
+
+def main():
+    print(f'memory per item     dict: {bytes_per_item(dict):7.1f} B   NewsItem: {bytes_per_item(lambda f: NewsItem(**f)):7.1f} B')
+
+    dict_items = [make_fields(i) for i in range(ITEMS)]
+    snapshot = build_snapshot([NewsItem(**f) for f in dict_items])
+
+    dict_time = timeit.timeit(lambda: JSONResponse(jsonable_encoder(dict_items[:LIMIT])).body, number=ROUNDS)
+    fast_time = timeit.timeit(lambda: json_response(snapshot.encoded[:LIMIT]).body, number=ROUNDS)
+    print(f'encode limit={LIMIT}     dict: {dict_time / ROUNDS * 1e6:7.1f} us  cached: {fast_time / ROUNDS * 1e6:7.1f} us')
+
+    build_time = timeit.timeit(lambda: build_snapshot(snapshot.items), number=10)
+    print(f'snapshot build ({ITEMS} items, once per refresh): {build_time / 10 * 1e3:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
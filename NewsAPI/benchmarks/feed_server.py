@@ -0,0 +1,110 @@
+"""Local HTTP stand-in for the publisher feeds.
+
+Serves fixture bodies at /<source>/<n>.xml and can inject latency, errors
+and 304 Not Modified responses. ``use_feed_server`` points the registry in
+index.py at it, so the whole fetch pipeline runs without network access.
+"""
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import fixtures
+
+
+class FeedServer:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 not_modified: bool = False, seed: int = 0, port: int = 0):
+        self.bodies = fixtures.load_all()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.not_modified = not_modified
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {'200': 0, '304': 0, '500': 0}
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self.handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with server.lock:
+                    delay = server.latency + server.random.uniform(0, server.jitter)
+                    fail = server.random.random() < server.error_rate
+                if delay:
+                    time.sleep(delay)
+                source = self.path.strip('/').split('/')[0]
+                body = server.bodies.get(source)
+                if body is None or fail:
+                    server.count('500')
+                    self.send_response(500 if body is not None else 404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                etag = f'"{source}-{len(body)}"'
+                if server.not_modified and self.headers.get('If-None-Match') == etag:
+                    server.count('304')
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                server.count('200')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                if server.not_modified:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The streaming extractor hangs up once it has enough items
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def count(self, status: str):
+        with self.lock:
+            self.counts[status] += 1
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def use_feed_server(index, server: FeedServer):
+    # Rewrite every registered feed URL to a unique path on the stand-in. The
+    # first feed of a source with a variant fixture serves that variant, so the
+    # Atom and non-well-formed paths run end to end as well
+    variants = {source: name for name, (source, _) in fixtures.VARIANTS.items()}
+    for category, feeds in index.sources.items():
+        index.sources[category] = [
+            (source, f'{server.base_url}/{variants.pop(source, source)}/{category}-{n}.xml')
+            for n, (source, _) in enumerate(feeds)
+        ]
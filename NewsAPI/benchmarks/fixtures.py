@@ -0,0 +1,183 @@
+"""Feed bodies for every source in FEED_SPECS, for offline benchmarks.
+
+Recorded bodies in benchmarks/fixtures/<source>.xml are used when present
+(``python benchmarks/fixtures.py --record`` downloads one feed per source).
+Otherwise a deterministic body is generated in the shape that publisher
+emits: where the thumbnail lives, how the description is wrapped and which
+date format it uses. VARIANTS add an Atom feed and a feed that is not
+well-formed XML, so the Atom branch of the extractor and its feedparser
+fallback are measured too.
+"""
+import argparse
+import os
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+ITEMS_PER_FIXTURE = 40
+
+NAMESPACES = (
+    'xmlns:media="http://search.yahoo.com/mrss/" '
+    'xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+    'xmlns:dc="http://purl.org/dc/elements/1.1/"'
+)
+
+# Per-source item shape: thumbnail element, description style and date style
+SHAPES = {
+    'wired': ('media_thumbnail', 'plain', 'rfc_gmt'),
+    'indiatoday': ('description_img', 'anchor', 'rfc_offset'),
+    'cnbc': (None, 'plain', 'rfc_gmt'),
+    'firstpost': ('media_content', 'plain', 'rfc_offset'),
+    'hindustantimes': ('media_content', 'html', 'rfc_gmt'),
+    'nytimes': ('media_content', 'html', 'rfc_gmt'),
+    'mint': ('media_content', 'plain', 'rfc_offset'),
+    'ndtv': ('media_content', 'content_only', 'rfc_ist'),
+    'indianexpress': ('media_thumbnail', 'content_only', 'rfc_offset'),
+    'toi': ('enclosure', 'anchor', 'iso'),
+    'thehindu': ('media_content', 'plain', 'rfc_offset'),
+    'bbc': ('media_thumbnail', 'plain', 'rfc_gmt'),
+    'techcrunch': ('content_img', 'plain', 'rfc_offset'),
+}
+
+# Extra fixtures, parsed with the named source's spec: (source, format)
+VARIANTS = {
+    'wired-atom': ('wired', 'atom'),
+    'toi-malformed': ('toi', 'malformed'),
+}
+
+TEXT = (
+    'The announcement follows months of speculation about the company\'s plans '
+    'and is expected to reshape the market over the coming year. '
+)
+
+
+def item_date(style: str, i: int) -> str:
+    hour, minute = divmod(i * 17, 60)
+    hour %= 24
+    if style == 'rfc_gmt':
+        return f'Mon, 18 Aug 2025 {hour:02d}:{minute:02d}:00 GMT'
+    if style == 'rfc_offset':
+        return f'Mon, 18 Aug 2025 {hour:02d}:{minute:02d}:00 +0530'
+    if style == 'rfc_ist':
+        return f'Mon, 18 Aug 2025 {hour:02d}:{minute:02d}:00 IST'
+    return f'2025-08-18T{hour:02d}:{minute:02d}:00+05:30'
+
+
+def spec_source(name: str) -> str:
+    # The FEED_SPECS entry a fixture is parsed with
+    return VARIANTS[name][0] if name in VARIANTS else name
+
+
+def rss_item(source: str, i: int, malformed: bool = False) -> str:
+    thumb, desc_style, date_style = SHAPES[source]
+    link = f'https://www.{source}.example.com/news/story-{i}.html'
+    image = f'https://img.{source}.example.com/{i}.jpg'
+    # A bare ampersand outside CDATA, as some publishers emit, is not well-formed XML
+    title = (f'<title>{source} headline {i:03d}: markets & policy react</title>' if malformed
+             else f'<title><![CDATA[{source} headline {i:03d}: markets react to policy change]]></title>')
+    parts = [
+        title,
+        f'<link>{link}</link>',
+        f'<guid isPermaLink="true">{link}</guid>',
+        f'<pubDate>{item_date(date_style, i)}</pubDate>',
+        f'<dc:creator>Staff {i % 7}</dc:creator>',
+    ]
+    if desc_style == 'plain':
+        parts.append(f'<description><![CDATA[{TEXT * 2}]]></description>')
+    elif desc_style == 'html':
+        parts.append(f'<description><![CDATA[<p>{TEXT}</p><p><b>{TEXT}</b></p>]]></description>')
+    elif desc_style == 'anchor':
+        img = f'<img src="{image}" width="300"/>' if thumb == 'description_img' else ''
+        parts.append(f'<description><![CDATA[<a href="{link}">{img}</a>{TEXT}]]></description>')
+    elif desc_style == 'content_only':
+        parts.append('<description></description>')
+    body_img = f'<img src="{image}"/>' if thumb == 'content_img' else ''
+    parts.append(f'<content:encoded><![CDATA[<p>{body_img}{TEXT * 6}</p>]]></content:encoded>')
+    if thumb == 'media_thumbnail':
+        parts.append(f'<media:thumbnail url="{image}" width="240" height="135"/>')
+    elif thumb == 'media_content':
+        parts.append(f'<media:content url="{image}" medium="image" width="640"><media:title>{source}</media:title></media:content>')
+    elif thumb == 'enclosure':
+        parts.append(f'<enclosure url="{image}" length="0" type="image/jpeg"/>')
+    return '<item>' + ''.join(parts) + '</item>'
+
+
+def atom_entry(source: str, i: int) -> str:
+    link = f'https://www.{source}.example.com/news/story-{i}.html'
+    image = f'https://img.{source}.example.com/{i}.jpg'
+    date = item_date('iso', i)
+    return (
+        f'<entry><title type="text">{source} headline {i:03d}: markets react to policy change</title>'
+        f'<link rel="alternate" type="text/html" href="{link}"/>'
+        f'<link rel="enclosure" type="image/jpeg" href="{image}"/>'
+        f'<id>{link}</id><published>{date}</published><updated>{date}</updated>'
+        f'<author><name>Staff {i % 7}</name></author>'
+        f'<summary type="text">{TEXT * 2}</summary>'
+        f'<content type="html">&lt;p&gt;{TEXT * 6}&lt;/p&gt;</content>'
+        f'<media:thumbnail url="{image}" width="240" height="135"/></entry>'
+    )
+
+
+def generate(name: str, items: int = ITEMS_PER_FIXTURE) -> bytes:
+    source, kind = VARIANTS.get(name, (name, 'rss'))
+    if kind == 'atom':
+        body = ''.join(atom_entry(source, i) for i in range(items))
+        return (
+            f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom" {NAMESPACES}>'
+            f'<title>{source}</title><id>https://www.{source}.example.com/</id>'
+            f'<link rel="alternate" href="https://www.{source}.example.com/"/>'
+            f'<updated>{item_date("iso", 0)}</updated>{body}</feed>'
+        ).encode('utf-8')
+    body = ''.join(rss_item(source, i, malformed=kind == 'malformed') for i in range(items))
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0" {NAMESPACES}><channel>'
+        f'<title>{source}</title><link>https://www.{source}.example.com/</link>'
+        f'<description>{source} fixture</description>{body}</channel></rss>'
+    ).encode('utf-8')
+
+
+def load(name: str) -> bytes:
+    path = os.path.join(FIXTURE_DIR, f'{name}.xml')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    return generate(name)
+
+
+def load_all():
+    from index import FEED_SPECS
+    return {name: load(name) for name in [*FEED_SPECS, *VARIANTS]}
+
+
+def record():
+    # Download the first registered feed of each source into FIXTURE_DIR
+    from index import FEED_SPECS, sources
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    first = {}
+    for feeds in sources.values():
+        for source, url in feeds:
+            first.setdefault(source, url)
+    for source, url in first.items():
+        headers = FEED_SPECS[source].headers or {}
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=20) as resp:
+                body = resp.read()
+        except OSError as e:
+            print(f'{source}: {e}')
+            continue
+        with open(os.path.join(FIXTURE_DIR, f'{source}.xml'), 'wb') as f:
+            f.write(body)
+        print(f'{source}: {len(body)} bytes from {url}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--record', action='store_true', help='download live feeds into benchmarks/fixtures/')
+    args = parser.parse_args()
+    if args.record:
+        record()
+    else:
+        for source, body in load_all().items():
+            print(f'{source:15} {len(body):8} bytes')
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+import index
+from index import FeedHealth
+
+FEED = ('wired', 'https://feeds.example.com/breaker.xml', 'technology')
+
+
+class Clock:
+    # Stands in for the time module inside index
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(index, 'time', clock)
+    monkeypatch.setattr(index, 'BREAKER_FAILURES', 3)
+    monkeypatch.setattr(index, 'BREAKER_BACKOFF', 30.0)
+    monkeypatch.setattr(index, 'BREAKER_MAX_BACKOFF', 100.0)
+    monkeypatch.setattr(index, 'feed_health', {})
+    return clock
+
+
+def open_breaker(health):
+    for _ in range(index.BREAKER_FAILURES):
+        health.failure('boom', 0.1)
+
+
+def test_opens_after_consecutive_failures(clock):
+    health = FeedHealth()
+    health.failure('boom', 0.1)
+    health.failure('boom', 0.1)
+    assert health.state == 'closed' and health.allow()
+    health.failure('boom', 0.1)
+    assert health.state == 'open'
+    assert health.retry_at == clock.now + 30.0
+    assert not health.allow()
+
+
+def test_success_resets_the_failure_count(clock):
+    health = FeedHealth()
+    health.failure('boom', 0.1)
+    health.failure('boom', 0.1)
+    health.success(0.1)
+    health.failure('boom', 0.1)
+    assert health.state == 'closed'
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    health = FeedHealth()
+    open_breaker(health)
+    clock.now += 29.9
+    assert not health.allow()
+    clock.now += 0.1
+    assert health.allow()
+    assert health.state == 'half-open'
+    assert not health.allow()
+
+
+def test_successful_probe_closes_and_resets_backoff(clock):
+    health = FeedHealth()
+    open_breaker(health)
+    clock.now += 30.0
+    assert health.allow()
+    health.failure('still down', 0.1)
+    assert health.backoff == 60.0
+    clock.now += 60.0
+    assert health.allow()
+    health.success(0.2)
+    assert health.state == 'closed'
+    assert health.failures == 0
+    assert health.backoff == 30.0
+    assert health.allow()
+
+
+def test_failed_probes_double_backoff_up_to_the_cap(clock):
+    health = FeedHealth()
+    open_breaker(health)
+    backoffs = []
+    for _ in range(4):
+        clock.now = health.retry_at
+        assert health.allow()
+        health.failure('still down', 0.1)
+        assert health.state == 'open'
+        backoffs.append(health.retry_at - clock.now)
+    assert backoffs == [60.0, 100.0, 100.0, 100.0]
+
+
+def test_slow_fetches_count_as_failures_and_open_the_breaker(clock, monkeypatch):
+    calls = []
+
+    async def slow_parse_feed(source, rss_url, category):
+        calls.append(rss_url)
+        clock.now += index.FEED_LATENCY_BUDGET + 1
+        return []
+
+    monkeypatch.setattr(index, 'parse_feed', slow_parse_feed)
+
+    async def fetch_times(n):
+        for _ in range(n):
+            await index.guarded_fetch(*FEED)
+
+    asyncio.run(fetch_times(3))
+    health = index.feed_health[FEED[1]]
+    assert health.state == 'open'
+    assert health.last_error.startswith('slow: ')
+    # Open: served from the last good items without touching the feed
+    asyncio.run(fetch_times(1))
+    assert len(calls) == 3
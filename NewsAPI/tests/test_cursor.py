@@ -0,0 +1,57 @@
+import base64
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+from index import NewsItem, build_snapshot, category_response, decode_since, encode_cursor
+
+
+def make_snapshot(timestamps):
+    return build_snapshot([
+        NewsItem(f'story {i}', f'https://example.com/{i}', '', '', '', 'technology', float(ts))
+        for i, ts in enumerate(timestamps)
+    ])
+
+
+def poll_all(snapshot, limit, since):
+    # Follows X-Next-Cursor until a poll comes back empty
+    seen = []
+    for _ in range(len(snapshot.items) + 2):
+        response = category_response(snapshot, limit, since)
+        page = [item.decode() for item in snapshot.encoded if item in response.body]
+        if not page:
+            return seen
+        seen.extend(page)
+        since = response.headers['X-Next-Cursor']
+    raise AssertionError('cursor did not advance')
+
+
+def test_equal_timestamps_at_window_edge_are_not_skipped():
+    snapshot = make_snapshot([105, 104, 103, 103, 102])
+    seen = poll_all(snapshot, 2, '100')
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+def test_run_of_equal_timestamps_larger_than_limit_is_returned_whole():
+    snapshot = make_snapshot([104, 103, 103, 103, 102])
+    response = category_response(snapshot, 2, '102')
+    assert response.body.count(b'"title"') == 3
+    assert len(poll_all(snapshot, 2, '100')) == 5
+
+
+def test_cursor_round_trips():
+    assert decode_since(encode_cursor(1700000000.25)) == 1700000000.25
+
+
+@pytest.mark.parametrize('value', ['nan', 'inf', '-inf', 'Infinity'])
+def test_non_finite_since_is_rejected(value):
+    cursor = base64.urlsafe_b64encode(value.encode('ascii')).decode('ascii').rstrip('=')
+    for since in (value, cursor):
+        with pytest.raises(HTTPException) as excinfo:
+            decode_since(since)
+        assert excinfo.value.status_code == 400
@@ -0,0 +1,42 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+from index import parse_date
+
+UTC_10AM = datetime(2025, 8, 18, 10, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize('value', [
+    'Mon, 18 Aug 2025 10:00:00 GMT',
+    'Mon, 18 Aug 2025 15:30:00 +0530',
+    'Mon, 18 Aug 2025 15:30:00 IST',
+    '18 Aug 2025 11:00:00 BST',
+    '2025-08-18T15:30:00+05:30',
+    '2025-08-18T10:00:00Z',
+    '  2025-08-18T10:00:00+00:00  ',
+])
+def test_offsets_and_zone_names_normalize_to_utc(value):
+    assert parse_date(value) == UTC_10AM
+
+
+def test_naive_times_are_taken_as_utc():
+    assert parse_date('2025-08-18T10:00:00') == UTC_10AM
+    assert parse_date('Aug 18, 2025 10:00 AM') == UTC_10AM
+
+
+@pytest.mark.parametrize('value', [
+    'August 18, 2025 03:30 PM IST',
+    'August 18, 2025 03:30 PM +0530',
+])
+def test_long_month_fallback_with_zone(value):
+    assert parse_date(value) == UTC_10AM
+
+
+@pytest.mark.parametrize('value', ['', '   ', 'not a date', 'Mon, 32 Aug 2025 10:00:00 GMT', '18/08/2025'])
+def test_unknown_or_invalid_dates_return_none(value):
+    assert parse_date(value) is None
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+from index import NewsItem, canonical_link, dedupe, title_fingerprint
+
+
+@pytest.mark.parametrize('link', [
+    'https://www.example.com/news/story.html',
+    'https://m.example.com/news/story.html',
+    'https://amp.example.com/amp/news/story.html',
+    'HTTPS://WWW.EXAMPLE.COM/news/story.html?utm_source=feed&fbclid=abc',
+])
+def test_canonical_link_drops_host_prefixes_amp_and_tracking(link):
+    assert canonical_link(link) == 'example.com/news/story.html'
+
+
+def test_canonical_link_drops_amp_suffixes_and_trailing_slash():
+    assert canonical_link('https://example.com/news/story/amp') == 'example.com/news/story'
+    assert canonical_link('https://example.com/news/story.amp') == 'example.com/news/story'
+    assert canonical_link('https://example.com/news/story/') == 'example.com/news/story'
+
+
+def test_canonical_link_keeps_meaningful_query_in_stable_order():
+    assert canonical_link('https://example.com/a?id=2&page=1&utm_medium=rss') == 'example.com/a?id=2&page=1'
+    assert canonical_link('https://example.com/a?page=1&id=2') == 'example.com/a?id=2&page=1'
+
+
+def test_title_fingerprint_ignores_case_punctuation_order_and_filler():
+    expected = title_fingerprint('Markets react to policy change')
+    assert expected
+    assert title_fingerprint('Policy change: MARKETS react!') == expected
+    assert title_fingerprint('The markets react to the policy change') == expected
+
+
+def test_title_fingerprint_folds_accents():
+    assert title_fingerprint('Café prices rise sharply') == title_fingerprint('Cafe prices rise sharply')
+
+
+def test_short_titles_have_no_fingerprint():
+    assert title_fingerprint('Big win') == ''
+    assert title_fingerprint('Live updates: the win') == ''
+
+
+def test_dedupe_keeps_first_copy_by_link_or_title():
+    def item(title, link):
+        return NewsItem(title, link, '', '', '', 'technology')
+
+    items = [
+        item('Markets react to policy change', 'https://www.a.com/story'),
+        item('Something else entirely here', 'https://a.com/story?utm_source=x'),
+        item('Policy change: markets react', 'https://b.com/other'),
+        item('Unrelated headline about science', 'https://c.com/science'),
+    ]
+    unique, duplicates = dedupe(items)
+    assert unique == [items[0], items[3]]
+    assert duplicates == 2
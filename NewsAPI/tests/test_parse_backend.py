@@ -0,0 +1,101 @@
+import asyncio
+import os
+import sys
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+import index
+from index import FeedStore
+
+FEED = ('wired', 'https://feeds.example.com/backend.xml', 'technology')
+
+
+def rss(items: int, padding: int = 0) -> bytes:
+    entries = ''.join(
+        f'<item><title>story {i}</title><link>https://example.com/{i}</link>'
+        f'<description>{"x" * padding}</description>'
+        f'<pubDate>Mon, 18 Aug 2025 10:{i % 60:02d}:00 GMT</pubDate></item>'
+        for i in range(items)
+    )
+    return f'<?xml version="1.0"?><rss><channel>{entries}</channel></rss>'.encode()
+
+
+class Response:
+    status_code = 200
+
+    def __init__(self, body: bytes, headers: dict):
+        self.payload = body
+        self.headers = headers
+        self.num_bytes_downloaded = len(body)
+
+    def raise_for_status(self):
+        pass
+
+
+class ChunkedClient:
+    # Serves one body in small chunks, with whatever headers the test gives
+    def __init__(self, body: bytes, headers: dict):
+        self.response = Response(body, headers)
+
+    @asynccontextmanager
+    async def stream(self, url, headers):
+        yield self.response
+
+    async def body(self, resp):
+        for start in range(0, len(resp.payload), 1024):
+            yield resp.payload[start:start + 1024]
+
+    async def release(self, resp, body):
+        pass
+
+
+class RecordingPool:
+    # Runs parse_body in-process and records which bodies were sent to the pool
+    def __init__(self):
+        self.bodies = []
+
+    def submit(self, fn, *args):
+        self.bodies.append(args[1])
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = RecordingPool()
+    monkeypatch.setattr(index, 'PARSE_BACKEND', 'process')
+    monkeypatch.setattr(index, 'PARSE_INLINE_MAX_BYTES', 8 * 1024)
+    monkeypatch.setattr(index, 'parse_pool', pool)
+    monkeypatch.setattr(index, 'feed_store', FeedStore())
+    monkeypatch.setattr(index, 'snapshot_file', None)
+    return pool
+
+
+def fetch(monkeypatch, body: bytes, headers: dict):
+    monkeypatch.setattr(index, 'feed_client', ChunkedClient(body, headers))
+    return asyncio.run(index.parse_feed(*FEED))
+
+
+def test_small_chunked_body_is_parsed_inline(monkeypatch, pool):
+    items = fetch(monkeypatch, rss(5), {})
+    assert len(items) == 5
+    assert pool.bodies == []
+
+
+def test_large_chunked_body_goes_to_the_pool_whole(monkeypatch, pool):
+    body = rss(20, padding=1000)
+    items = fetch(monkeypatch, body, {})
+    assert len(items) == index.ITEMS_PER_FEED
+    assert pool.bodies == [body]
+
+
+def test_small_compressed_length_does_not_keep_a_large_body_inline(monkeypatch, pool):
+    # Under gzip Content-Length is the compressed size, far below the decompressed body
+    body = rss(20, padding=1000)
+    fetch(monkeypatch, body, {'Content-Length': '900', 'Content-Encoding': 'gzip'})
+    assert pool.bodies == [body]
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+import index
+from index import FeedStore, NewsItem, SnapshotFile
+
+FEED = ('wired', 'https://feeds.example.com/snapshot.xml', 'technology')
+ITEMS = [NewsItem('story', 'https://example.com/story', '', '', '', 'technology', 100.0)]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+
+class NotModifiedClient:
+    # Answers every conditional GET with a 304 carrying the given validators
+    def __init__(self, headers):
+        self.headers = headers
+        self.requests = []
+
+    @asynccontextmanager
+    async def stream(self, url, headers):
+        self.requests.append(headers)
+        yield type('Response', (), {'status_code': 304, 'headers': self.headers})()
+
+
+@pytest.fixture
+def setup(monkeypatch, tmp_path):
+    clock = Clock()
+    store = FeedStore()
+    snapshots = SnapshotFile(str(tmp_path / 'feeds.db'))
+    monkeypatch.setattr(index, 'time', clock)
+    monkeypatch.setattr(index, 'feed_store', store)
+    monkeypatch.setattr(index, 'snapshot_file', snapshots)
+    _, rss_url, _ = FEED
+    store.save(rss_url, '"v1"', 'Mon, 01 Jan 2024 00:00:00 GMT', ITEMS)
+    snapshots.save(rss_url, '"v1"', 'Mon, 01 Jan 2024 00:00:00 GMT', ITEMS)
+    return clock, store, snapshots
+
+
+def fetch_not_modified(monkeypatch, headers):
+    client = NotModifiedClient(headers)
+    monkeypatch.setattr(index, 'feed_client', client)
+    return client, asyncio.run(index.parse_feed(*FEED))
+
+
+def test_not_modified_refreshes_saved_at(monkeypatch, setup):
+    clock, _, snapshots = setup
+    clock.now += 3600
+    _, items = fetch_not_modified(monkeypatch, {})
+    assert [item.link for item in items] == [ITEMS[0].link]
+    loaded = snapshots.load(60)
+    assert FEED[1] in loaded
+    state, saved_at = loaded[FEED[1]]
+    assert saved_at == clock.now
+    assert state.etag == '"v1"'
+    assert state.modified == 'Mon, 01 Jan 2024 00:00:00 GMT'
+
+
+def test_not_modified_stores_new_validators(monkeypatch, setup):
+    _, store, snapshots = setup
+    fetch_not_modified(monkeypatch, {'ETag': '"v2"'})
+    assert store.get(FEED[1]).etag == '"v2"'
+    assert store.get(FEED[1]).modified == 'Mon, 01 Jan 2024 00:00:00 GMT'
+    state, _ = snapshots.load(60)[FEED[1]]
+    assert state.etag == '"v2"'
+    assert state.modified == 'Mon, 01 Jan 2024 00:00:00 GMT'
+    client, _ = fetch_not_modified(monkeypatch, {})
+    assert client.requests[0]['If-None-Match'] == '"v2"'
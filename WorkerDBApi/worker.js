@@ -1,3 +1,16 @@
+async function fetchNews(newsApiUrl) {
+  const response = await fetch(newsApiUrl, {
+    headers: {
+      'User-Agent': 'NewsApp/1.0'
+    }
+  });
+  if (!response.ok) {
+    const errorBody = await response.text();
+    throw new Error(`0xarc-newsapi request failed with status ${response.status}: ${errorBody}`);
+  }
+  return response.json();
+}
+
 async function refreshDatabase(env) {
   const categories = ['business', 'entertainment', 'health', 'science', 'sports', 'technology'];
 
@@ -26,23 +39,32 @@ async function refreshDatabase(env) {
     }
   }
 
+  // One batch request returns every category, so NewsAPI loads them concurrently
+  let batch = {};
+  try {
+    batch = await fetchNews(`news_api_url/batch?categories=${categories.join(',')}`);
+  } catch (error) {
+    console.error('Error fetching or parsing news batch, falling back to per-category requests:', error);
+    errors.push(`Error fetching or parsing news batch: ${error.message}`);
+  }
+
   for (const category of categories) {
-    const newsApiUrl = `news_api_url`;
+    const result = batch[category];
     let data = [];
-    try {
-      const response = await fetch(newsApiUrl, {
-        headers: {
-          'User-Agent': 'NewsApp/1.0'
-        }
-      });
-      if (!response.ok) {
-        const errorBody = await response.text();
-        throw new Error(`0xarc-newsapi request failed with status ${response.status}: ${errorBody}`);
+    if (result && result.error) {
+      console.error(`0xarc-newsapi error for ${category}:`, result.error);
+      errors.push(`Error fetching or parsing news for ${category}: ${result.error}`);
+    } else if (result) {
+      data = result.items;
+    } else {
+      // The batch call failed or left this category out: losing one category
+      // request must not cost the others their data
+      try {
+        data = await fetchNews(`news_api_url/${category}`);
+      } catch (error) {
+        console.error(`Error fetching or parsing news for ${category}:`, error);
+        errors.push(`Error fetching or parsing news for ${category}: ${error.message}`);
       }
-      data = await response.json();
-    } catch (error) {
-      console.error(`Error fetching or parsing news for ${category}:`, error);
-      errors.push(`Error fetching or parsing news for ${category}: ${error.message}`);
     }
 
     if (Array.isArray(data) && data.length > 0) {
@@ -108,8 +130,6 @@ async function refreshDatabase(env) {
     } else {
       console.log(`No articles returned for ${category}`);
     }
-
-    await new Promise(resolve => setTimeout(resolve, 2000));
   }
 
   try {